@@ -0,0 +1,124 @@
+# File: backfill.py
+import csv
+import json
+import os
+import sys
+
+import database_manager
+from path_config import CSV_FOLDER
+from circuit_breaker import Deadline
+
+MIN_CONFIDENCE = 0.75 # Same threshold as main.apply_category
+
+
+class BackfillJob:
+    """
+    Re-categorizes the UNCATEGORIZED rows of all items_*.csv partitions.
+    - names are deduplicated (normalized) over the whole history and asked only once
+    - rules, memory and cache answer first, the rest goes to the AI in rate-limited batches
+    - each partition is rewritten once (atomic replace) as soon as its names are resolved
+    - answers are checkpointed, so an interrupted run resumes without asking the AI again
+    """
+
+    def __init__(self, categorizer, batch_size=50):
+        self.categorizer = categorizer
+        self.batch_size = batch_size
+        self.checkpoint_file = CSV_FOLDER / "backfill_checkpoint.json"
+        self.answers = {} # Normalized name -> [category, confidence]
+
+    def scan(self):
+        """Returns [(items_file, {normalized name: name})] for partitions with UNCATEGORIZED rows."""
+        partitions = []
+        for items_file in sorted(CSV_FOLDER.glob("items_*.csv")):
+            names = {}
+            with open(items_file, mode='r', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    name = row.get('item_name')
+                    if name and row.get('category') == "UNCATEGORIZED":
+                        names.setdefault(self.categorizer.normalize(name), name)
+            if names:
+                partitions.append((items_file, names))
+        return partitions
+
+    def run(self, on_progress=print, should_stop=None):
+        """
+        Runs (or resumes) the backfill. Returns True when all partitions are done,
+        False if it stopped early (AI unavailable or should_stop() returned True).
+        """
+        self.answers = self._load_checkpoint()
+        failed = {} # Normalized name -> name, no AI answer in this run
+        partitions = self.scan()
+        distinct = len({key for _, names in partitions for key in names})
+        on_progress(f"Backfill: {distinct} distinct UNCATEGORIZED names in {len(partitions)} partitions "
+                    f"({len(self.answers)} already answered).")
+
+        fixed_total = 0
+        for index, (items_file, names) in enumerate(partitions, 1):
+            unknown = [name for key, name in names.items() if key not in self.answers and key not in failed]
+
+            for start in range(0, len(unknown), self.batch_size):
+                if should_stop and should_stop():
+                    on_progress("Backfill paused, run again to resume.")
+                    return False
+
+                chunk = unknown[start:start + self.batch_size]
+                results = self.categorizer.get_categories(chunk, Deadline(self.categorizer.receipt_budget))
+                for name, (category, confidence) in zip(chunk, results):
+                    key = self.categorizer.normalize(name)
+                    if confidence > 0:
+                        self.answers[key] = [category, confidence]
+                    else:
+                        failed[key] = name
+                self._save_checkpoint()
+
+                if all(confidence == 0 for _, confidence in results):
+                    on_progress("AI unavailable, backfill stopped. Run again to resume.")
+                    return False
+
+            fixed = self._rewrite(items_file)
+            fixed_total += fixed
+            on_progress(f"[{index}/{len(partitions)}] {items_file.name}: {fixed} rows re-categorized.")
+
+        # Done: names that still failed stay UNCATEGORIZED and are asked again on the next run
+        if self.checkpoint_file.exists():
+            self.checkpoint_file.unlink()
+        on_progress(f"Backfill finished: {fixed_total} rows re-categorized, {len(failed)} names still unanswered.")
+        return True
+
+    def _rewrite(self, items_file):
+        """Applies confident answers to one partition (one atomic rewrite). Returns the number of fixed rows."""
+        # Read and rewrite under the partition lock: rows a running import appends meanwhile are kept
+        with database_manager.partition_lock:
+            categories = {} # Data row index -> category
+            with open(items_file, mode='r', encoding='utf-8') as f:
+                for row_index, row in enumerate(csv.DictReader(f)):
+                    name = row.get('item_name')
+                    if not name or row.get('category') != "UNCATEGORIZED":
+                        continue
+                    answer = self.answers.get(self.categorizer.normalize(name))
+                    if answer and answer[1] >= MIN_CONFIDENCE:
+                        categories[row_index] = answer[0]
+            return database_manager.update_item_categories(items_file, categories) if categories else 0
+
+    def _load_checkpoint(self):
+        if not self.checkpoint_file.exists():
+            return {}
+        try:
+            with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+                return json.load(f)["answers"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"   [!] Backfill checkpoint unreadable, starting over: {e}")
+            return {}
+
+    def _save_checkpoint(self):
+        temp_file = f"{self.checkpoint_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({"answers": self.answers}, f, ensure_ascii=False)
+        os.replace(temp_file, self.checkpoint_file)
+
+
+if __name__ == "__main__":
+    # Usage: python backfill.py
+    from categorizer import ProductCategorizer
+    finished = BackfillJob(ProductCategorizer()).run()
+    sys.exit(0 if finished else 1)
@@ -0,0 +1,77 @@
+# File: benchmark.py
+# Offline end-to-end throughput benchmark of main.process_single_file.
+# The AI runs against fake_llm_server.py, all data lives in a throwaway home folder,
+# so neither the real API nor the real CSV database is touched.
+#
+# Usage:
+#   python benchmark.py path/to/sample_pdfs --repeat 3 --latency-mean 0.4 --latency-std 0.1 --rate-429 0.05
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import fake_llm_server
+
+
+def main():
+    parser = fake_llm_server.build_parser()
+    parser.description = "Offline throughput benchmark of process_single_file."
+    parser.add_argument("samples", help="Folder with sample receipt PDFs")
+    parser.add_argument("--repeat", type=int, default=1, help="How often every sample is processed")
+    parser.add_argument("--keep-home", action="store_true", help="Keep the temporary home folder")
+    parser.set_defaults(port=0) # Any free port
+    args = parser.parse_args()
+
+    samples = sorted(Path(args.samples).glob("*.pdf"))
+    if not samples:
+        print(f"No PDFs found in {args.samples}")
+        return
+
+    server = fake_llm_server.create_server(args)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://{args.host}:{server.server_address[1]}"
+
+    # Must be set before main (path_config, categorizer) is imported
+    home = tempfile.mkdtemp(prefix="receipt_bench_")
+    os.environ["HOME"] = os.environ["USERPROFILE"] = home
+    os.environ["GROQ_BASE_URL"] = url
+    os.environ["GROQ_API_KEY"] = "fake"
+    os.environ["OLLAMA_HOST"] = url
+
+    import main as logic
+    from path_config import INPUT_FOLDER
+
+    durations = []
+    statuses = {}
+    start = time.perf_counter()
+    for run in range(args.repeat):
+        for sample in samples:
+            target = INPUT_FOLDER / f"{run}_{sample.name}"
+            shutil.copy(sample, target)
+
+            t0 = time.perf_counter()
+            status = logic.process_single_file(str(target))
+            durations.append(time.perf_counter() - t0)
+            statuses[status] = statuses.get(status, 0) + 1
+    total = time.perf_counter() - start
+    server.shutdown()
+
+    durations.sort()
+    p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+    print("\n--- Benchmark ---")
+    print(f"Files:       {len(durations)} in {total:.2f}s ({len(durations) / total:.2f} files/s)")
+    print(f"Per file:    median {statistics.median(durations) * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms")
+    print(f"LLM server:  {server.faults.stats}")
+    print(f"Results:     {statuses}")
+
+    if args.keep_home:
+        print(f"Data kept in {home}")
+    else:
+        shutil.rmtree(home, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
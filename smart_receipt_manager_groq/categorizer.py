@@ -1,102 +1,408 @@
-# File: categorizer.py (v1.5 - Cloud Version)
-import json
-import os
-import re
-from groq import Groq
-import rules_config  # CATEGORIES, FALSE_FRIENDS, HARDCODED_RULES
-from path_config import CSV_FOLDER, SETTINGS_FILE
-
-class ProductCategorizer:
-    def __init__(self):
-        self.model_name = "llama-3.3-70b-versatile"
-        self.mapping_file = CSV_FOLDER / "manual_mappings.json"
-        self.manual_mappings = self.load_mappings()
-        self.client = None # Initialized on demand
-
-    def _get_api_key(self):
-        """Retrieve API key from settings or environment."""
-        # 1. Check settings.json (GUI user input)
-        if SETTINGS_FILE.exists():
-            try:
-                with open(SETTINGS_FILE, 'r') as f:
-                    key = json.load(f).get("groq_key", "")
-                    if key: return key
-            except: pass
-        
-        # 2. Fallback: Hardcoded key for distribution
-        # Replace this with your key when building the executable
-        return "YOUR_FALLBACK_KEY_HERE"
-
-    def load_mappings(self):
-        if os.path.exists(self.mapping_file):
-            try:
-                with open(self.mapping_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except: return {}
-        return {}
-
-    def normalize(self, text):
-        text = text.lower().strip()
-        text = re.sub(r'[^a-z0-9äöüß ]', ' ', text)
-        return " ".join(text.split())
-
-    def get_category(self, item_name):
-        if not item_name:
-            return "UNCATEGORIZED", 0.0
-
-        clean_name = self.normalize(item_name)
-
-        # 1. Local rules (False Friends)
-        for word, category in rules_config.FALSE_FRIENDS.items():
-            if word.lower() in clean_name:
-                return category, 1.0
-
-        # 2. Local rules (Hardcoded)
-        for category, keywords in rules_config.HARDCODED_RULES.items():
-            if any(kw.lower() in clean_name for kw in keywords):
-                return category, 1.0
-
-        # 3. Memory (Manual mappings)
-        if item_name in self.manual_mappings:
-            return self.manual_mappings[item_name], 1.0
-
-        # 4. Cloud AI
-        return self.ask_cloud_llm(item_name)
-
-    def ask_cloud_llm(self, original_name):
-        key = self._get_api_key()
-        if not key or "YOUR_FALLBACK" in key:
-            return "UNCATEGORIZED", 0.0
-
-        if not self.client:
-            self.client = Groq(api_key=key)
-
-        category_list = ", ".join(rules_config.CATEGORIES)
-        prompt = f"""
-        Categorize this German supermarket item: "{original_name}"
-        Choose EXACTLY ONE from this list: {category_list}
-        Return ONLY the category name.
-        """
-
-        try:
-            completion = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.0,
-                max_tokens=20
-            )
-            ai_response = completion.choices[0].message.content.strip()
-            
-            for cat in rules_config.CATEGORIES:
-                if cat.lower() in ai_response.lower():
-                    return cat, 0.98
-            
-            return "Miscellaneous", 0.70
-        except Exception as e:
-            print(f"   [!] Groq API Error: {e}")
-            return "UNCATEGORIZED", 0.0
-
-    def save_manual_mapping(self, item_name, correct_category):
-        self.manual_mappings[item_name] = correct_category
-        with open(self.mapping_file, 'w', encoding='utf-8') as f:
-            json.dump(self.manual_mappings, f, indent=4, ensure_ascii=False)
\ No newline at end of file
+# File: categorizer.py (v1.5 - Cloud Version)
+import hashlib
+import json
+import os
+import re
+from functools import partial
+import rules_config  # CATEGORIES, FALSE_FRIENDS, HARDCODED_RULES
+from path_config import CSV_FOLDER, SETTINGS_FILE
+from rule_matcher import RuleMatcher
+from llm_cache import LLMCache
+from fuzzy_index import TrigramIndex
+from local_classifier import LocalClassifier
+import database_manager
+from mapping_journal import MappingJournal
+from groq_client import RateLimitedGroqClient
+from ollama_backend import OllamaBackend, SYSTEM_PROMPT as OLLAMA_PROMPT, ANSWER_SCHEMA as OLLAMA_SCHEMA
+from hedging import HedgedRunner
+from circuit_breaker import BudgetExhausted, CircuitBreaker, Deadline, NO_DEADLINE
+
+# Compact protocol: the categories are numbered once in a fixed system message (the provider can
+# reuse the cached prefix), the model answers with category numbers only (JSON mode).
+# Its hash (with the Ollama prompt) is part of the AI cache key, so editing it invalidates cached answers.
+SYSTEM_PROMPT = (
+    "You categorize German supermarket items.\n"
+    "Categories:\n"
+    + "\n".join(f"{i}: {cat}" for i, cat in enumerate(rules_config.CATEGORIES))
+    + "\n\nThe user sends numbered items, one per line.\n"
+    "Answer ONLY with a JSON object mapping each item number to its category number, "
+    'e.g. {"0": 4, "1": 11}'
+)
+TOKENS_PER_ANSWER = 10 # '  "12": 13,\n' in a pretty-printed JSON answer
+ANSWER_OVERHEAD = 16 # Braces and whitespace around the entries
+ANSWER_ENTRY = re.compile(r'"(\d+)"\s*:\s*"?(\d+)"?\s*[,}\n]') # Complete entries of a cut-off answer
+
+class ProductCategorizer:
+    def __init__(self):
+        self.model_name = "llama-3.3-70b-versatile"
+        self.mapping_file = CSV_FOLDER / "manual_mappings.json"
+        self.mapping_journal = MappingJournal(self.mapping_file, CSV_FOLDER / "manual_mappings.jsonl")
+        self.manual_mappings = self.load_mappings()
+
+        # Fuzzy memory: similar spellings (OCR variants) resolve to the same correction.
+        # Keep the threshold >= 0.75, the similarity is returned as confidence.
+        self.mapping_index = TrigramIndex(threshold=0.75)
+        for name, category in self.manual_mappings.items():
+            self.mapping_index.add(self.normalize(name), category)
+
+        # Offline classifier between memory and AI (train: python local_classifier.py train)
+        self.classifier_file = CSV_FOLDER / "local_classifier.npz"
+        self.classifier_threshold = 0.85 # Below this, the AI decides
+        self.local_classifier = self.load_local_classifier()
+        self.client = None # Initialized on demand
+        self.base_url = os.environ.get("GROQ_BASE_URL") # None = Groq cloud (fake_llm_server.py for offline runs)
+        self.batch_size = 50 # Max. items per batched Groq request
+
+        # Groq limits for the model (free tier), shared by all concurrent requests
+        self.requests_per_minute = 30
+        self.tokens_per_minute = 12000
+        self.max_in_flight = 4
+        self.rule_matcher = RuleMatcher() # Compiled once from rules_config
+        self.llm_cache = LLMCache(CSV_FOLDER / "llm_cache.sqlite", self.prompt_version())
+
+        # AI backends after rules and memory, in chain order. The next backend is hedged in when the
+        # current one is slower than its usual p90 latency, or right away when it fails.
+        self.local_llm = OllamaBackend() # Optional, switches itself off if Ollama is not running
+        self.backend_order = ["ollama", "groq"]
+        self.hedger = HedgedRunner(percentile=90)
+
+        # Failures must cost milliseconds: a shared time budget per receipt and one breaker per backend.
+        # Items that could not be asked are marked UNCATEGORIZED, the backfill job (backfill.py) finds
+        # them in the CSV files and asks again later.
+        self.receipt_budget = 30.0 # Seconds of AI time per receipt
+        self.breakers = {"ollama": CircuitBreaker("Ollama"), "groq": CircuitBreaker("Groq")}
+
+    def prompt_version(self):
+        """Short hash over prompts and category list (part of the AI cache key)."""
+        source = SYSTEM_PROMPT + OLLAMA_PROMPT + json.dumps(OLLAMA_SCHEMA)
+        return hashlib.sha1(source.encode("utf-8")).hexdigest()[:12]
+
+    def _get_api_key(self):
+        """Retrieve API key from settings or environment."""
+        # 1. Check settings.json (GUI user input)
+        if SETTINGS_FILE.exists():
+            try:
+                with open(SETTINGS_FILE, 'r') as f:
+                    key = json.load(f).get("groq_key", "")
+                    if key: return key
+            except: pass
+
+        # 2. Environment variable
+        key = os.environ.get("GROQ_API_KEY", "")
+        if key: return key
+        
+        # 3. Fallback: Hardcoded key for distribution
+        # Replace this with your key when building the executable
+        return "YOUR_FALLBACK_KEY_HERE"
+
+    def load_mappings(self):
+        """Loads manual corrections (snapshot + journal)."""
+        mappings = self.mapping_journal.load()
+        if self.mapping_journal.needs_compaction():
+            self.mapping_journal.compact(mappings)
+        return mappings
+
+    def load_local_classifier(self):
+        if self.classifier_file.exists():
+            try:
+                return LocalClassifier.load(self.classifier_file)
+            except Exception as e:
+                print(f"   [!] Could not load local classifier: {e}")
+        return None
+
+    def train_local_classifier(self):
+        """Trains the offline classifier from the CSV database and the manual mappings."""
+        samples = database_manager.load_categorized_items() + list(self.manual_mappings.items())
+        samples = [(self.normalize(name), cat) for name, cat in samples if cat in rules_config.CATEGORIES]
+
+        if len({cat for _, cat in samples}) < 2:
+            print("Not enough categorized items to train the local classifier.")
+            return False
+
+        model = LocalClassifier()
+        model.train([name for name, _ in samples], [cat for _, cat in samples])
+        model.save(self.classifier_file)
+        self.local_classifier = model
+
+        print(f"Local classifier trained on {len(samples)} items ({len(model.categories)} categories).")
+        return True
+
+    def normalize(self, text):
+        text = text.lower().strip()
+        text = re.sub(r'[^a-z0-9äöüß ]', ' ', text)
+        return " ".join(text.split())
+
+    def get_local_category(self, item_name):
+        """Rules, memory and classifier tiers (no network). Returns None if the AI is needed."""
+        if not item_name:
+            return "UNCATEGORIZED", 0.0
+
+        clean_name = self.normalize(item_name)
+
+        # 1. + 2. Local rules (False Friends, then Hardcoded) in one pass
+        category = self.rule_matcher.match(clean_name)
+        if category:
+            return category, 1.0
+
+        # 3. Memory (Manual mappings): exact, then similar spellings
+        if item_name in self.manual_mappings:
+            return self.manual_mappings[item_name], 1.0
+
+        fuzzy = self.mapping_index.lookup(clean_name)
+        if fuzzy:
+            return fuzzy
+
+        # 4. Offline classifier (confident predictions only)
+        if self.local_classifier:
+            prediction = self.local_classifier.predict(clean_name)
+            if prediction and prediction[1] >= self.classifier_threshold:
+                return prediction
+
+        return None
+
+    def get_category(self, item_name, deadline=None):
+        local = self.get_local_category(item_name)
+        if local:
+            return local
+
+        # 5. Cache of earlier AI answers
+        cached = self.cached_answer(self.normalize(item_name))
+        if cached:
+            return cached
+
+        # 6. AI backends (local model, Groq), good answers are cached by the backend wrapper
+        return self.ask_ai(item_name, deadline or Deadline(self.receipt_budget))
+
+    def get_categories(self, item_names, deadline=None):
+        """
+        Batch version of get_category for a whole receipt.
+        Rules, memory and cache are resolved locally, all remaining names go to the AI in one request per chunk.
+        All AI calls share one Deadline (default: receipt_budget seconds from now).
+        Returns a list of (category, confidence) in the same order as item_names.
+        """
+        deadline = deadline or Deadline(self.receipt_budget)
+        results = [None] * len(item_names)
+        pending = {} # Name -> list of indices (asked only once per batch)
+
+        for i, name in enumerate(item_names):
+            local = self.get_local_category(name)
+            if not local and name not in pending:
+                local = self.cached_answer(self.normalize(name))
+
+            if local:
+                results[i] = local
+            else:
+                pending.setdefault(name, []).append(i)
+
+        # Chunks are sent concurrently, limited by the client's rate limiter
+        names = list(pending)
+        chunks = [names[start:start + self.batch_size] for start in range(0, len(names), self.batch_size)]
+        answers = {}
+        for chunk, chunk_answers in zip(chunks, self._run_parallel(partial(self.ask_ai_batch, deadline=deadline), chunks)):
+            answers.update(zip(chunk, chunk_answers))
+
+        # Per-item fallback only for entries no backend answered in the batch
+        retry = [name for name, answer in answers.items() if answer is None]
+        answers.update(zip(retry, self._run_parallel(partial(self.ask_ai, deadline=deadline), retry)))
+        if names:
+            print(f"AI backends: {self.hedger.report()}")
+
+        for name, answer in answers.items():
+            for i in pending[name]:
+                results[i] = answer
+
+        return results
+
+    def _run_parallel(self, fn, items):
+        """Runs fn over items on the Groq client's pool (sequentially without API key)."""
+        client = self._get_client()
+        if client and len(items) > 1:
+            return client.map(fn, items)
+        return [fn(item) for item in items]
+
+    def _backends(self, batch, deadline):
+        """Available AI backends in chain order as (name, fn). Backends with an open circuit are left out."""
+        available = {} # Name -> (fn, model)
+        if self.local_llm.enabled:
+            available["ollama"] = (self.local_llm.ask_batch if batch else self.local_llm.ask, self.local_llm.model_name)
+        if self._get_client():
+            available["groq"] = (self.ask_cloud_llm_batch if batch else self.ask_cloud_llm, self.model_name)
+
+        # Batches and single items have their own latency statistics
+        suffix = " batch" if batch else ""
+        return [
+            (name + suffix, self._guarded(name, available[name][1], partial(available[name][0], deadline=deadline), batch))
+            for name in self.backend_order
+            if name in available and not self.breakers[name].is_open()
+        ]
+
+    def _guarded(self, name, model, fn, batch):
+        """
+        Wraps a backend call with its circuit breaker. Only real errors count as failures, not a spent time budget.
+        Good answers are cached under the model that gave them.
+        """
+        breaker = self.breakers[name]
+        is_ok = self._batch_ok if batch else self._single_ok
+
+        def call(arg):
+            failed = [("UNCATEGORIZED", 0.0)] * len(arg) if batch else ("UNCATEGORIZED", 0.0)
+            if not breaker.allow():
+                return failed
+            try:
+                result = fn(arg)
+            except BudgetExhausted:
+                breaker.release() # Slow (e.g. rate limited) is not broken
+                return failed
+            if is_ok(result):
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
+            # Errors (confidence 0.0) and unparsed entries are asked again next time
+            for item_name, answer in (zip(arg, result) if batch else [(arg, result)]):
+                if self._entry_ok(answer):
+                    self.llm_cache.put(self.normalize(item_name), model, *answer)
+            return result
+        return call
+
+    def _single_ok(self, result):
+        return result[1] > 0
+
+    def _entry_ok(self, entry):
+        return entry is not None and entry[1] > 0
+
+    def _batch_ok(self, results):
+        """A backend that answers part of a batch is healthy (the rest goes to the next one)."""
+        return any(self._entry_ok(r) for r in results)
+
+    def ask_ai(self, original_name, deadline=NO_DEADLINE):
+        """One item through the hedged backend chain."""
+        backends = self._backends(False, deadline)
+        result = self.hedger.run(backends, original_name, self._single_ok, deadline) if backends else None
+        return result or ("UNCATEGORIZED", 0.0)
+
+    def ask_ai_batch(self, original_names, deadline=NO_DEADLINE):
+        """
+        Several items through the hedged backend chain, merged per item: items a backend failed on
+        (or could not parse) go to the next one. Entries no backend answered are None (asked per item).
+        """
+        backends = self._backends(True, deadline)
+        if not backends:
+            return [None] * len(original_names)
+        return self.hedger.run_batch(backends, original_names, self._entry_ok, deadline)
+
+    def cached_answer(self, clean_name):
+        """Earlier AI verdict for a name (Groq's first, then the local model's). None on a miss."""
+        for model in (self.model_name, self.local_llm.model_name):
+            cached = self.llm_cache.get(clean_name, model)
+            if cached:
+                return cached
+        return None
+
+    def _get_client(self):
+        """Returns the Groq client, or None if no API key is configured."""
+        key = self._get_api_key()
+        if not key or "YOUR_FALLBACK" in key:
+            return None
+
+        if not self.client:
+            self.client = RateLimitedGroqClient(
+                key,
+                base_url=self.base_url,
+                requests_per_minute=self.requests_per_minute,
+                tokens_per_minute=self.tokens_per_minute,
+                max_in_flight=self.max_in_flight
+            )
+        return self.client
+
+    def ask_cloud_llm(self, original_name, deadline=NO_DEADLINE):
+        if not self._get_client():
+            return "UNCATEGORIZED", 0.0
+
+        try:
+            answers = json.loads(self._complete_ids([original_name], deadline)[0])
+            category = self._category_from_id(answers.get("0")) if isinstance(answers, dict) else None
+        except BudgetExhausted:
+            raise # Not Groq's fault, see _guarded
+        except Exception as e:
+            print(f"   [!] Groq API Error: {e}")
+            return "UNCATEGORIZED", 0.0
+
+        if category:
+            return category, 0.98
+        return "UNCATEGORIZED", 0.0
+
+    def ask_cloud_llm_batch(self, original_names, deadline=NO_DEADLINE):
+        """
+        Categorizes several items with one chat completion in JSON mode.
+        Returns one entry per name: (category, confidence), or None if that entry could not be parsed.
+        """
+        if not self._get_client():
+            return [("UNCATEGORIZED", 0.0)] * len(original_names)
+
+        try:
+            ai_response, truncated = self._complete_ids(original_names, deadline)
+        except BudgetExhausted:
+            raise # Not Groq's fault, see _guarded
+        except Exception as e:
+            # The whole request failed: the next backend (or the per-item path) takes over, the breaker counts it
+            print(f"   [!] Groq API Error: {e}")
+            return [("UNCATEGORIZED", 0.0)] * len(original_names)
+
+        try:
+            answers = json.loads(ai_response or "")
+            if not isinstance(answers, dict): raise ValueError("Expected a JSON object")
+        except ValueError as e:
+            # Keep the entries that arrived complete, only the rest falls back per item
+            answers = dict(ANSWER_ENTRY.findall(ai_response or ""))
+            reason = "cut off at max_tokens" if truncated else e
+            print(f"   [!] Groq batch answer not parsable ({reason}), using {len(answers)} of {len(original_names)} entries")
+
+        results = []
+        for i in range(len(original_names)):
+            category = self._category_from_id(answers.get(str(i)))
+            results.append((category, 0.98) if category else None)
+        return results
+
+    def _complete_ids(self, original_names, deadline=NO_DEADLINE):
+        """
+        One JSON-mode completion in the category-number protocol.
+        Returns (raw answer text, True if it was cut off at max_tokens).
+        """
+        item_list = "\n".join(f"{i}: {name}" for i, name in enumerate(original_names))
+        completion = self.client.complete(
+            model=self.model_name,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": item_list}
+            ],
+            temperature=0.0,
+            max_tokens=TOKENS_PER_ANSWER * len(original_names) + ANSWER_OVERHEAD,
+            response_format={"type": "json_object"},
+            deadline=deadline
+        )
+        choice = completion.choices[0]
+        return choice.message.content, choice.finish_reason == "length"
+
+    def _category_from_id(self, answer):
+        """Category for a category number (int or digit string), None for anything else."""
+        if isinstance(answer, str) and answer.strip().isdigit():
+            answer = int(answer)
+        if type(answer) is int and 0 <= answer < len(rules_config.CATEGORIES):
+            return rules_config.CATEGORIES[answer]
+        return None
+
+    def save_manual_mapping(self, item_name, correct_category):
+        """Saves a manual correction (one journal append, no full rewrite)."""
+        self.save_manual_mappings([(item_name, correct_category)])
+
+    def save_manual_mappings(self, corrections):
+        """Saves several (item_name, category) corrections with one journal write."""
+        corrections = list(corrections)
+        for item_name, correct_category in corrections:
+            self.manual_mappings[item_name] = correct_category
+            self.mapping_index.add(self.normalize(item_name), correct_category)
+
+        self.mapping_journal.append_many(corrections)
+        if self.mapping_journal.needs_compaction():
+            self.mapping_journal.compact(self.manual_mappings)
\ No newline at end of file
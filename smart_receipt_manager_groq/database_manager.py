@@ -1,44 +1,111 @@
-import os
-import csv
-from path_config import CSV_FOLDER
-
-def save_to_csv(header_data, items_data):
-    base_path = CSV_FOLDER
-
-    if not os.path.exists(base_path):
-        os.makedirs(base_path)
-    
-    receipt_id = header_data[1][0]
-    year = receipt_id[:4] # Extract year for header partitioning
-    year_month = receipt_id[:6] # Extract month for item partitioning
-
-    # Define filenames
-    header_file = os.path.join(base_path, f"header_{year}.csv")
-
-    # Duplicate Check: Verify if ID already exists in header file
-    if os.path.isfile(header_file):
-        with open(header_file, mode='r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            if any(row and row[0] == receipt_id for row in reader):
-                print(f"Skipping: ID {receipt_id} already exists in database.")
-                return False
-
-    items_file = os.path.join(base_path, f"items_{year_month}.csv")
-
-    # Helper function to write/append data to CSV
-    def write_csv(file_path, data):
-        file_exists = os.path.isfile(file_path)
-        with open(file_path, mode='a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            if not file_exists:
-                writer.writerow(data[0]) # Write header only if file is new
-
-            writer.writerows(data[1:]) # Write data rows
-    
-    # Save header and item data
-    write_csv(header_file, header_data)
-    write_csv(items_file, items_data)
-
-    print(f"Data saved to {header_file} and {items_file}")
-
-    return True
\ No newline at end of file
+import os
+import csv
+import threading
+from path_config import CSV_FOLDER
+
+# Appends and rewrites of the partition files (processing, backfill, table edits run in different threads).
+# A rewrite re-reads the file under the lock, so rows appended meanwhile are never lost.
+partition_lock = threading.RLock()
+
+def save_to_csv(header_data, items_data):
+    base_path = CSV_FOLDER
+
+    if not os.path.exists(base_path):
+        os.makedirs(base_path)
+    
+    receipt_id = header_data[1][0]
+    year = receipt_id[:4] # Extract year for header partitioning
+    year_month = receipt_id[:6] # Extract month for item partitioning
+
+    # Define filenames
+    header_file = os.path.join(base_path, f"header_{year}.csv")
+
+    with partition_lock:
+        # Duplicate Check: Verify if ID already exists in header file
+        if os.path.isfile(header_file):
+            with open(header_file, mode='r', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                if any(row and row[0] == receipt_id for row in reader):
+                    print(f"Skipping: ID {receipt_id} already exists in database.")
+                    return False
+
+        items_file = os.path.join(base_path, f"items_{year_month}.csv")
+
+        # Helper function to write/append data to CSV
+        def write_csv(file_path, data):
+            file_exists = os.path.isfile(file_path)
+            with open(file_path, mode='a', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                if not file_exists:
+                    writer.writerow(data[0]) # Write header only if file is new
+
+                writer.writerows(data[1:]) # Write data rows
+    
+        # Save header and item data
+        write_csv(header_file, header_data)
+        write_csv(items_file, items_data)
+
+    print(f"Data saved to {header_file} and {items_file}")
+
+    return True
+
+def load_categorized_items():
+    """Returns (item_name, category) for all categorized rows of the items_*.csv partitions."""
+    labelled = []
+    for items_file in sorted(CSV_FOLDER.glob("items_*.csv")):
+        with open(items_file, mode='r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                name = row.get('item_name')
+                category = row.get('category')
+                if name and category and category != "UNCATEGORIZED":
+                    labelled.append((name, category))
+    return labelled
+
+def update_item_categories(items_file, categories):
+    """
+    Sets new categories in one items_*.csv partition ({data row index: category}).
+    Data rows are numbered like csv.DictReader does (blank lines are skipped), as all callers index them.
+    The file is rewritten once (temp file + atomic replace). Returns the number of changed rows.
+    """
+    with partition_lock:
+        with open(items_file, mode='r', encoding='utf-8', newline='') as f:
+            rows = list(csv.reader(f))
+        if not rows:
+            return 0
+
+        header = rows[0]
+        cat_col = header.index("category") if "category" in header else 4
+
+        data_rows = [row for row in rows[1:] if row]
+        changed = 0
+        for index, category in categories.items():
+            row = data_rows[index] if index < len(data_rows) else None
+            if row and len(row) > cat_col and row[cat_col] != category:
+                row[cat_col] = category
+                changed += 1
+
+        if changed:
+            temp_file = f"{items_file}.tmp"
+            with open(temp_file, mode='w', encoding='utf-8', newline='') as f:
+                csv.writer(f).writerows(rows)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, items_file)
+        return changed
+
+def build_name_index(normalize, clean_names=None):
+    """
+    Index normalized item name -> [(items_file, data row index, category)] over all partitions.
+    clean_names limits the index to these names (one scan, small memory footprint).
+    """
+    index = {}
+    for items_file in sorted(CSV_FOLDER.glob("items_*.csv")):
+        with open(items_file, mode='r', encoding='utf-8') as f:
+            for row_index, row in enumerate(csv.DictReader(f)):
+                name = row.get('item_name')
+                if not name:
+                    continue
+                clean_name = normalize(name)
+                if clean_names is None or clean_name in clean_names:
+                    index.setdefault(clean_name, []).append((items_file, row_index, row.get('category')))
+    return index
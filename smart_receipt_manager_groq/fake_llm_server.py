@@ -0,0 +1,268 @@
+# File: fake_llm_server.py
+# Local stand-in for Groq (OpenAI chat completions) and Ollama (/api/generate, /api/embed).
+# Answers deterministically and can inject latency, 429s, timeouts and malformed replies.
+#
+# Usage:
+#   python fake_llm_server.py --port 8000 --latency-mean 0.3 --rate-429 0.1 --seed 1
+# Point the app at it:
+#   Groq:   GROQ_BASE_URL=http://127.0.0.1:8000  GROQ_API_KEY=fake
+#   Ollama: OLLAMA_HOST=http://127.0.0.1:8000
+import argparse
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+import random
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import rules_config
+from rule_matcher import RuleMatcher
+
+
+def normalize(text):
+    # Same as ProductCategorizer.normalize
+    text = text.lower().strip()
+    text = re.sub(r'[^a-z0-9äöüß ]', ' ', text)
+    return " ".join(text.split())
+
+
+class Oracle:
+    """Deterministic answers: recorded cassette first, then rules_config, then 'Miscellaneous'."""
+
+    def __init__(self, cassette_file=None):
+        self.rule_matcher = RuleMatcher()
+        self.cassette = {}
+        if cassette_file:
+            with open(cassette_file, 'r', encoding='utf-8') as f:
+                self.cassette = {normalize(name): cat for name, cat in json.load(f).items()}
+
+    def categorize(self, item_name):
+        """Category number of an item (index into rules_config.CATEGORIES)."""
+        return self.categorize_with_probability(item_name)[0]
+
+    def categorize_with_probability(self, item_name):
+        """(category number, probability): known items are sure, the Miscellaneous fallback is not."""
+        clean_name = normalize(item_name)
+        category = self.cassette.get(clean_name) or self.rule_matcher.match(clean_name)
+        if category not in rules_config.CATEGORIES:
+            return rules_config.CATEGORIES.index("Miscellaneous"), 0.4
+        return rules_config.CATEGORIES.index(category), 0.99
+
+    def answer_items(self, item_list):
+        """Groq protocol: numbered items, one per line -> {"0": category number, ...}."""
+        items = re.findall(r'^\s*(\d+): (.+)$', item_list, flags=re.MULTILINE)
+        return json.dumps({index: self.categorize(name) for index, name in items})
+
+    def answer_item(self, item_name):
+        """Ollama protocol: one item name -> ({"c": category number}, probability)."""
+        category_id, probability = self.categorize_with_probability(item_name)
+        return json.dumps({"c": category_id}), probability
+
+    def embed(self, text, dim=256):
+        """Hashed character-trigram vector: similar names get similar vectors."""
+        vector = np.zeros(dim, dtype=np.float32)
+        padded = f"  {normalize(text)} "
+        for i in range(len(padded) - 2):
+            digest = hashlib.md5(padded[i:i + 3].encode("utf-8")).digest()
+            vector[int.from_bytes(digest[:4], "little") % dim] += 1.0
+        return vector.tolist()
+
+
+class FaultInjector:
+    """Seeded random faults, so a benchmark run can be repeated exactly."""
+
+    def __init__(self, args):
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "429": 0, "timeout": 0, "malformed": 0, "aborted": 0}
+
+    def draw(self):
+        """Returns (latency_seconds, fault) with fault in None, '429', 'timeout', 'malformed'."""
+        with self.lock:
+            latency = max(0.0, self.random.gauss(self.args.latency_mean, self.args.latency_std))
+            roll = self.random.random()
+
+            fault = None
+            if roll < self.args.rate_429:
+                fault = "429"
+            elif roll < self.args.rate_429 + self.args.rate_timeout:
+                fault = "timeout"
+            elif roll < self.args.rate_429 + self.args.rate_timeout + self.args.rate_malformed:
+                fault = "malformed"
+
+            self.stats["requests"] += 1
+            if fault: self.stats[fault] += 1
+        return latency, fault
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    oracle = None
+    faults = None
+    args = None
+
+    def log_message(self, format, *args):
+        if self.args.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode("utf-8") if not isinstance(data, bytes) else data
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.send_json(400, {"error": "invalid JSON"})
+            return
+
+        latency, fault = self.faults.draw()
+        time.sleep(latency)
+
+        if fault == "429":
+            self.send_json(429, {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+                           {"retry-after": str(self.args.retry_after)})
+            return
+        if fault == "timeout":
+            time.sleep(self.args.timeout_seconds)
+
+        if self.path.endswith("/chat/completions"):
+            self.chat_completions(request, fault)
+        elif self.path == "/api/generate":
+            self.ollama_generate(request, fault)
+        elif self.path == "/api/embed":
+            self.send_json(200, {"model": request.get("model"),
+                                 "embeddings": [self.oracle.embed(t) for t in self._as_list(request.get("input"))]})
+        else:
+            self.send_json(404, {"error": f"unknown endpoint {self.path}"})
+
+    def _as_list(self, value):
+        if value is None: return []
+        return value if isinstance(value, list) else [value]
+
+    def chat_completions(self, request, fault):
+        messages = request.get("messages", [])
+        prompt = "\n".join(m.get("content", "") for m in messages)
+        user_messages = [m.get("content", "") for m in messages if m.get("role") == "user"]
+        content = self.oracle.answer_items(user_messages[-1] if user_messages else "")
+        if fault == "malformed":
+            content = "Sure! I think this is probably {not json"
+
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = max(1, len(content) // 4)
+        self.send_json(200, {
+            "id": f"chatcmpl-fake-{time.time_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    def ollama_generate(self, request, fault):
+        prompt = request.get("prompt")
+        if not prompt:
+            # Warm-up / load request
+            self.send_json(200, {"model": request.get("model"), "response": "", "done": True})
+            return
+
+        content, probability = self.oracle.answer_item(prompt)
+        if fault == "malformed":
+            self.send_json(200, b'{"model": "fake", "response": "{\\"c\\": 1')
+            return
+
+        tokens = re.findall(r'\d+|\s+|[^\d\s]+', content)
+        logprobs = [
+            {"token": token, "logprob": math.log(probability if token.isdigit() else 0.999)}
+            for token in tokens
+        ] if request.get("logprobs") else None
+
+        if request.get("stream", True):
+            self.stream_tokens(request.get("model"), tokens, logprobs)
+        else:
+            time.sleep(self.args.token_latency * len(tokens))
+            data = {"model": request.get("model"), "response": content, "done": True}
+            if logprobs: data["logprobs"] = logprobs
+            self.send_json(200, data)
+
+    def stream_tokens(self, model, tokens, logprobs=None):
+        """Ollama streaming: one JSON line per token, the connection closes after the last one."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            for i, token in enumerate(tokens):
+                time.sleep(self.args.token_latency)
+                chunk = {"model": model, "response": token, "done": False}
+                if logprobs: chunk["logprobs"] = [logprobs[i]]
+                self.wfile.write(json.dumps(chunk).encode("utf-8") + b"\n")
+                self.wfile.flush()
+            self.wfile.write(json.dumps({"model": model, "response": "", "done": True}).encode("utf-8") + b"\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.faults.stats["aborted"] += 1 # Client hung up early
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Local stand-in LLM server (Groq + Ollama protocols).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cassette", help="JSON file {item name: category} with recorded answers")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-mean", type=float, default=0.0, help="seconds")
+    parser.add_argument("--latency-std", type=float, default=0.0, help="seconds (normal distribution)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="retry-after header for 429s")
+    parser.add_argument("--rate-timeout", type=float, default=0.0, help="share of requests that hang")
+    parser.add_argument("--timeout-seconds", type=float, default=60.0, help="how long a hanging request sleeps")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="seconds per streamed Ollama token")
+    parser.add_argument("--rate-malformed", type=float, default=0.0, help="share of malformed replies")
+    parser.add_argument("--verbose", action="store_true")
+    return parser
+
+
+def create_server(args):
+    """Returns the (not yet started) server; server.faults.stats counts requests and faults."""
+    handler = type("Handler", (FakeLLMHandler,), {
+        "oracle": Oracle(args.cassette),
+        "faults": FaultInjector(args),
+        "args": args
+    })
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.daemon_threads = True # Hanging "timeout" requests must not block shutdown
+    server.faults = handler.faults
+    return server
+
+
+def main():
+    args = build_parser().parse_args()
+    server = create_server(args)
+    print(f"Fake LLM server on http://{args.host}:{args.port} "
+          f"({len(rules_config.CATEGORIES)} categories, cassette: {args.cassette or '-'})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+        print(f"Stats: {server.faults.stats}")
+
+
+if __name__ == "__main__":
+    main()
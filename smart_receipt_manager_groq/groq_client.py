@@ -0,0 +1,140 @@
+# File: groq_client.py
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import groq
+from groq import Groq
+
+from circuit_breaker import BudgetExhausted
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at rate_per_minute.
+    Used twice: once for requests per minute, once for tokens per minute.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0 # Tokens per second
+        self.capacity = capacity or rate_per_minute
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1, deadline=None):
+        """Blocks until 'amount' tokens are available, then takes them (BudgetExhausted past the deadline)."""
+        amount = min(amount, self.capacity) # A single huge request must not block forever
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            if deadline and wait > deadline.remaining():
+                raise BudgetExhausted("Time budget exhausted while waiting for the rate limit")
+            time.sleep(wait)
+
+    def adjust(self, delta):
+        """Corrects an estimate afterwards (positive = charge more, negative = refund)."""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+    def pause(self, seconds):
+        """Empties the bucket so nobody sends for 'seconds' (used on 429 with retry-after)."""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+class RateLimitedGroqClient:
+    """
+    Concurrent request layer for Groq chat completions.
+    - a thread pool bounds the number of requests in flight
+    - two token buckets model Groq's requests-per-minute and tokens-per-minute limits
+    - 429 and 5xx answers and timeouts are retried, honoring the retry-after header
+    - refused connections are not: they fail at once, so the circuit breaker sees them right away
+    """
+
+    def __init__(self, api_key, base_url=None, requests_per_minute=30, tokens_per_minute=12000,
+                 max_in_flight=4, max_retries=5, timeout=30.0):
+        # Retries are handled here, so the SDK must not retry on its own
+        self.client = Groq(api_key=api_key, base_url=base_url, max_retries=0, timeout=timeout)
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="groq")
+
+    def estimate_tokens(self, messages, max_tokens):
+        """Rough token estimate (~4 characters per token) plus the reserved answer tokens."""
+        chars = sum(len(m.get("content", "")) for m in messages)
+        return chars // 4 + max_tokens
+
+    def submit(self, messages, **kwargs):
+        """Schedules one chat completion. Returns a Future."""
+        return self.executor.submit(self.complete, messages, **kwargs)
+
+    def map(self, fn, items):
+        """Runs fn over items on the pool (bounded in-flight). Returns results in order."""
+        return list(self.executor.map(fn, items))
+
+    def complete(self, messages, max_tokens=20, deadline=None, **kwargs):
+        """Blocking chat completion with rate limiting and retries, bounded by an optional Deadline."""
+        estimate = self.estimate_tokens(messages, max_tokens)
+
+        for attempt in range(self.max_retries + 1):
+            if deadline and deadline.expired():
+                raise BudgetExhausted("Time budget exhausted")
+            self.request_bucket.acquire(1, deadline)
+            self.token_bucket.acquire(estimate, deadline)
+            timeout = deadline.timeout(self.timeout) if deadline else self.timeout
+
+            try:
+                completion = self.client.chat.completions.create(
+                    messages=messages, max_tokens=max_tokens, timeout=timeout, **kwargs
+                )
+            except groq.RateLimitError as e:
+                if attempt == self.max_retries: raise
+                wait = self._retry_after(e, attempt)
+                print(f"   [!] Groq rate limit (429), retrying in {wait:.1f}s")
+                self.request_bucket.pause(wait) # Holds back all threads, not just this one
+                continue
+            except (groq.APITimeoutError, groq.InternalServerError) as e:
+                if deadline and deadline.expired():
+                    # The request timeout was capped by the budget: out of time, Groq may be fine
+                    raise BudgetExhausted("Time budget exhausted during the request") from e
+                if attempt == self.max_retries: raise
+                wait = self._retry_after(e, attempt)
+                if deadline and wait > deadline.remaining(): raise
+                print(f"   [!] Groq unavailable ({e}), retrying in {wait:.1f}s")
+                time.sleep(wait)
+                continue
+
+            # Charge the real token usage instead of the estimate
+            usage = getattr(completion, "usage", None)
+            if usage and getattr(usage, "total_tokens", None):
+                self.token_bucket.adjust(usage.total_tokens - estimate)
+            return completion
+
+    def _retry_after(self, error, attempt):
+        """Seconds to wait: retry-after header if present, else exponential backoff with jitter."""
+        response = getattr(error, "response", None)
+        if response is not None:
+            value = response.headers.get("retry-after")
+            try:
+                if value: return max(0.0, float(value))
+            except ValueError:
+                pass
+        return min(60.0, 2 ** attempt) * (0.5 + random.random() / 2)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
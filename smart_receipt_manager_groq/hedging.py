@@ -0,0 +1,181 @@
+# File: hedging.py
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class LatencyTracker:
+    """Sliding window of the latest call durations of one backend."""
+
+    def __init__(self, window=200, min_samples=10):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, p, default):
+        """p-th percentile in seconds, or default while there are too few samples."""
+        with self.lock:
+            data = sorted(self.samples)
+        if len(data) < self.min_samples:
+            return default
+        return data[min(len(data) - 1, int(len(data) * p / 100))]
+
+
+class HedgedRunner:
+    """
+    Runs one call over a chain of backends:
+    - the first backend is asked right away
+    - the next one is fired when the current one has not answered within its p-th latency percentile,
+      or immediately when it failed
+    - the first good answer wins, slower answers are discarded
+    """
+
+    def __init__(self, percentile=90, default_delay=3.0, min_delay=0.2, max_workers=8):
+        self.percentile = percentile
+        self.default_delay = default_delay # Until a backend has enough latency samples
+        self.min_delay = min_delay
+        self.trackers = {} # Backend name -> LatencyTracker
+        self.wins = {} # Backend name -> number of answers used
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+
+    def _tracker(self, name):
+        with self.lock:
+            return self.trackers.setdefault(name, LatencyTracker())
+
+    def hedge_delay(self, name):
+        return max(self.min_delay, self._tracker(name).percentile(self.percentile, self.default_delay))
+
+    def _timed(self, name, fn, arg):
+        start = time.perf_counter()
+        try:
+            return fn(arg)
+        finally:
+            self._tracker(name).record(time.perf_counter() - start)
+
+    def run(self, backends, arg, is_ok, deadline=None):
+        """
+        backends: list of (name, fn) in chain order, each called as fn(arg).
+        Returns the first result with is_ok(result), else the first result received
+        (None if nothing arrived before the optional Deadline).
+        """
+        pending = {} # Future -> backend name
+        fallback = None
+        launched = 0
+
+        def launch():
+            nonlocal launched
+            name, fn = backends[launched]
+            pending[self.executor.submit(self._timed, name, fn, arg)] = name
+            launched += 1
+
+        launch()
+        while pending:
+            if deadline and deadline.expired():
+                break # Late answers are discarded
+
+            # Waiting is bounded only while there is a backend left to hedge with
+            timeout = self.hedge_delay(backends[launched - 1][0]) if launched < len(backends) else None
+            if deadline:
+                timeout = deadline.timeout(float("inf") if timeout is None else timeout)
+                if timeout == float("inf"): timeout = None # No deadline either
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                if launched < len(backends):
+                    launch() # Slow answer: hedge with the next backend
+                continue
+
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"   [!] {name} backend Error: {e}")
+                    continue
+                if is_ok(result):
+                    with self.lock:
+                        self.wins[name] = self.wins.get(name, 0) + 1
+                    return result
+                if fallback is None:
+                    fallback = result
+
+            # A failed backend hands over to the next one right away
+            if launched < len(backends):
+                launch()
+
+        return fallback
+
+    def run_batch(self, backends, items, is_ok, deadline=None):
+        """
+        run for a list of items, merged per item:
+        - each backend gets only the items without a good answer yet (a hedge: all of them,
+          after a failure: the ones no other backend is working on)
+        - fn(items) returns one entry per item, the first entry with is_ok(entry) wins
+        Returns one entry per item as soon as all have a good answer, None where no backend gave one
+        (before the optional Deadline).
+        """
+        results = [None] * len(items)
+        pending = {} # Future -> (backend name, item indices)
+        launched = 0
+
+        def launch(indices):
+            nonlocal launched
+            name, fn = backends[launched]
+            pending[self.executor.submit(self._timed, name, fn, [items[i] for i in indices])] = (name, indices)
+            launched += 1
+
+        def unanswered():
+            return [i for i, result in enumerate(results) if result is None]
+
+        launch(unanswered())
+        while pending:
+            if deadline and deadline.expired():
+                break # Late answers are discarded
+
+            timeout = self.hedge_delay(backends[launched - 1][0]) if launched < len(backends) else None
+            if deadline:
+                timeout = deadline.timeout(float("inf") if timeout is None else timeout)
+                if timeout == float("inf"): timeout = None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                if launched < len(backends):
+                    launch(unanswered()) # Slow answer: hedge with the next backend
+                continue
+
+            for future in done:
+                name, indices = pending.pop(future)
+                try:
+                    entries = future.result()
+                except Exception as e:
+                    print(f"   [!] {name} backend Error: {e}")
+                    continue
+                used = 0
+                for i, entry in zip(indices, entries):
+                    if results[i] is None and is_ok(entry):
+                        results[i] = entry
+                        used += 1
+                if used:
+                    with self.lock:
+                        self.wins[name] = self.wins.get(name, 0) + used
+            if not unanswered():
+                return results # Slower backends finish in the background, their answers are discarded
+
+            # Failed items hand over to the next backend right away, unless one is already on them
+            in_flight = {i for _, indices in pending.values() for i in indices}
+            orphans = [i for i in unanswered() if i not in in_flight]
+            if orphans and launched < len(backends):
+                launch(orphans)
+
+        return results
+
+    def report(self):
+        """Answers used per backend and their current hedge delay."""
+        with self.lock:
+            names = list(self.trackers)
+            wins = dict(self.wins)
+        return " | ".join(f"{name}: {wins.get(name, 0)} answers, hedge after {self.hedge_delay(name):.2f}s" for name in names)
@@ -1,67 +1,247 @@
-import os
-import pytesseract
-from PIL import Image, ImageOps, ImageEnhance
-
-from path_config import INPUT_FOLDER, TESSERACT_EXE
-
-# Configure Tesseract path from config
-pytesseract.pytesseract.tesseract_cmd = str(TESSERACT_EXE)
-
-folder_path = INPUT_FOLDER
-
-if TESSERACT_EXE.exists():
-    pytesseract.pytesseract.tesseract_cmd = str(TESSERACT_EXE)
-else:
-    # Fallback if tesseract_bin folder is missing
-    print(f"CRITICAL ERROR: Tesseract not found at {TESSERACT_EXE}")
-    print("Please ensure that the 'tesseract_bin' folder is in the program directory.")
-
-def process_receipt_folder(folder_path):
-    valid_extensions = ('.png', '.jpg', '.jpeg')
-    
-    if not os.path.exists(folder_path):
-        print(f"Error: Folder {folder_path} not found.")
-        return
-
-    for filename in os.listdir(folder_path):
-        if filename.lower().endswith(valid_extensions):
-            image_path = os.path.join(folder_path, filename)
-            base_name = os.path.splitext(filename)[0]
-            output_pdf_path = os.path.join(folder_path, f"{base_name}.pdf")
-            
-            try:
-                # 1. Open image
-                img = Image.open(image_path)
-                
-                # --- OPTIMIZATION ---
-                # Optimize image for OCR readability
-                
-                # Step A: Convert to grayscale
-                img = ImageOps.grayscale(img)
-                
-                # Step B: Auto-maximize contrast
-                img = ImageOps.autocontrast(img)
-                
-                # Optional: Sharpening for blurry photos
-                enhancer = ImageEnhance.Sharpness(img)
-                img = enhancer.enhance(2.0)
-                
-                # Convert to searchable PDF
-                # --psm 6 forces Tesseract to treat the image as a single text block
-                pdf_data = pytesseract.image_to_pdf_or_hocr(
-                    img, 
-                    extension='pdf', 
-                    lang='deu', 
-                    config='--psm 6' 
-                )
-                
-                with open(output_pdf_path, "wb") as f:
-                    f.write(pdf_data)
-                
-                if os.path.exists(output_pdf_path):
-                    img.close()
-                    os.remove(image_path)
-                    print(f"   [OK] Converted & Optimized: {base_name}.pdf")
-                
-            except Exception as e:
-                print(f"Error processing {filename}: {e}")
\ No newline at end of file
+import importlib.util
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pytesseract
+
+import read_receipt
+from image_preprocessing import preprocess
+from ocr_profiles import profile_chain, tesseract_args, tesseract_options
+from path_config import INPUT_FOLDER, TESSERACT_EXE
+
+# Configure Tesseract path from config
+pytesseract.pytesseract.tesseract_cmd = str(TESSERACT_EXE)
+
+folder_path = INPUT_FOLDER
+
+if TESSERACT_EXE.exists():
+    pytesseract.pytesseract.tesseract_cmd = str(TESSERACT_EXE)
+else:
+    # Fallback if tesseract_bin folder is missing
+    print(f"CRITICAL ERROR: Tesseract not found at {TESSERACT_EXE}")
+    print("Please ensure that the 'tesseract_bin' folder is in the program directory.")
+
+# OCR backends: "cli" starts tesseract.exe per image, "tesserocr" keeps one engine (libtesseract)
+# resident per pool process and hands it the image in memory. "auto" = tesserocr if installed.
+# The default stays "cli" until the resident path has been checked against tesseract.exe on real receipts,
+# set the OCR_BACKEND environment variable to "tesserocr" (or "auto") to opt in.
+OCR_BACKENDS = ("auto", "cli", "tesserocr")
+
+_engines = {} # Resident tesserocr engines of this pool process, by options (None = could not start)
+
+
+def _init_worker(tesseract_cmd, threads):
+    """Runs once in every pool process."""
+    # Each Tesseract call may only use its share of the cores (pool size x threads <= cores).
+    # tesseract.exe calls get the limit of their own pass (see _pdf_and_text), resident engines
+    # read this one once when libtesseract loads, so their fallback passes keep the first profile's threads.
+    os.environ["OMP_THREAD_LIMIT"] = str(threads)
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+
+def default_backend():
+    """OCR backend from the OCR_BACKEND environment variable, 'cli' if it is not set."""
+    return os.environ.get("OCR_BACKEND", "").strip().lower() or "cli"
+
+
+def resolve_backend(backend):
+    """'auto' -> 'tesserocr' if the package is installed, else 'cli'."""
+    if backend not in OCR_BACKENDS:
+        print(f"   [!] Unknown OCR backend '{backend}', using 'cli'.")
+        backend = "cli"
+    installed = importlib.util.find_spec("tesserocr") is not None
+    if backend == "tesserocr" and not installed:
+        print("   [!] tesserocr is not installed (pip install tesserocr), using tesseract.exe.")
+    if backend == "auto" or not installed:
+        return "tesserocr" if installed else "cli"
+    return backend
+
+
+def _resident_engine(options):
+    """The tesserocr engine for these options, started on first use (model loading is the expensive part)."""
+    key = repr(sorted(options.items()))
+    if key not in _engines:
+        try:
+            # Imported here, not at module level: OpenMP reads OMP_THREAD_LIMIT when libtesseract loads
+            import tesserocr
+            variables = dict(options["variables"], tessedit_create_pdf="1")
+            if options["user_words"]:
+                variables["user_words_file"] = options["user_words"] # Init-only, like --user-words
+            tessdata = options["tessdata_dir"] or os.environ.get("TESSDATA_PREFIX")
+            kwargs = {"path": tessdata} if tessdata else {}
+            _engines[key] = tesserocr.PyTessBaseAPI(lang=options["lang"], psm=options["psm"], variables=variables, **kwargs)
+        except Exception as e:
+            print(f"   [!] tesserocr Error: {e} - using tesseract.exe in this process.")
+            _engines[key] = None
+    return _engines[key]
+
+
+def _pdf_and_text_resident(api, img):
+    """Recognizes the in-memory image with a resident engine. Same result as _pdf_and_text."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_base = os.path.join(temp_dir, "page")
+        # No input file name: the PDF renderer then embeds the preprocessed image instead of reading a file
+        if not api.ProcessPage(output_base, img, 0, ""):
+            raise pytesseract.TesseractError(-1, "tesserocr could not process the image")
+        with open(f"{output_base}.pdf", "rb") as f:
+            pdf_data = f.read()
+    return pdf_data, api.GetUTF8Text() # Results of the page stay in the engine until the next image
+
+
+def _pdf_and_text(img, options, backend="cli"):
+    """One Tesseract run (options from ocr_profiles) that writes both the searchable PDF and the plain text."""
+    api = _resident_engine(options) if backend == "tesserocr" else None
+    if api is not None:
+        return _pdf_and_text_resident(api, img)
+
+    with pytesseract.pytesseract.save(img) as (temp_name, input_filename):
+        cmd = [pytesseract.pytesseract.tesseract_cmd, input_filename, temp_name, *tesseract_args(options), "pdf", "txt"]
+        kwargs = pytesseract.pytesseract.subprocess_args() # No console window on Windows
+        kwargs["env"] = dict(os.environ, OMP_THREAD_LIMIT=str(options["threads"])) # Threads of this pass's profile
+        proc = subprocess.run(cmd, **kwargs)
+        if proc.returncode:
+            raise pytesseract.TesseractError(proc.returncode, proc.stderr.decode("utf-8", "replace").strip())
+        with open(f"{temp_name}.pdf", "rb") as f:
+            pdf_data = f.read()
+        with open(f"{temp_name}.txt", "rb") as f:
+            text = f.read().decode("utf-8")
+    return pdf_data, text
+
+
+def _ocr_to_pdf(image_path, output_pdf_path, passes, backend="cli"):
+    """
+    Image -> searchable PDF + text (line structure as Tesseract saw it).
+    passes: [(preprocessing kwargs, Tesseract options), ...] from cheap to expensive. The next pass
+    only runs when the parsed text of the previous one fails read_receipt.check_receipt,
+    the pass with the fewest problems is kept.
+    Removes the image on success. Runs inside a pool process. Returns (pdf path, text, passes used).
+    """
+    best = None # (number of problems, pdf data, text)
+    for used, (preprocessing, options) in enumerate(passes, 1):
+        # 1. Decode, crop and scale to OCR resolution, grayscale, contrast, sharpen
+        img = preprocess(image_path, **preprocessing)
+
+        # 2. Convert to searchable PDF (archive) and text (parser) in one call
+        pdf_data, text = _pdf_and_text(img, options, backend)
+        img.close()
+        if len(passes) == 1:
+            best = (0, pdf_data, text)
+            break
+
+        # 3. Escalate only if the receipt does not add up
+        problems = read_receipt.check_receipt(*read_receipt.scan_receipt(None, text))
+        if best is None or len(problems) < best[0]:
+            best = (len(problems), pdf_data, text)
+        if not problems:
+            break
+        if used < len(passes):
+            print(f"   OCR pass {used} of {os.path.basename(image_path)} not plausible ({', '.join(problems)}), escalating.")
+    _, pdf_data, text = best
+
+    with open(output_pdf_path, "wb") as f:
+        f.write(pdf_data)
+
+    os.remove(image_path)
+    return str(output_pdf_path), text, used
+
+
+class ReceiptProcessor:
+    """
+    OCR engine of the import step: images -> searchable PDFs.
+    - a process pool sized to the core count runs the conversions in parallel
+    - OMP_THREAD_LIMIT is set per Tesseract call from the profile of the pass, the pool is sized
+      for the first profile, so pool workers and Tesseract threads do not oversubscribe the cores
+      (an escalated pass with more threads may briefly use more)
+    - convert_many yields the results as they complete (not in input order)
+    - images are cropped and scaled to OCR resolution first (see image_preprocessing)
+    - model, page segmentation, whitelist, user words and threads come from an OCR profile (see ocr_profiles)
+    - profiles with a fallback run a second, heavier pass only for receipts that fail validation
+    - backend "tesserocr" (opt-in, the app reads it from OCR_BACKEND) keeps the engine loaded in every pool process instead of starting tesseract.exe per image
+    """
+    valid_extensions = ('.png', '.jpg', '.jpeg')
+
+    def __init__(self, tesseract_exe, output_folder, max_workers=None, profile=None, preprocessing=None, backend="cli"):
+        self.tesseract_cmd = str(tesseract_exe)
+        self.output_folder = Path(output_folder)
+        chain = profile_chain(profile) # None = default from settings
+        self.profile = chain[0]
+        self.threads_per_worker = self.profile["threads"]
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 1) // self.threads_per_worker)
+        self.backend = resolve_backend(backend)
+
+        # (preprocessing, Tesseract options) per pass, the preprocessing argument overrides the first one
+        self.passes = [(p["preprocessing"], tesseract_options(p)) for p in chain]
+        if preprocessing is not None:
+            self.passes[0] = (preprocessing, self.passes[0][1])
+        self.stats = {"converted": 0, "escalated": 0}
+        self.pool = None # Started on the first batch
+
+    def _get_pool(self):
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.tesseract_cmd, self.threads_per_worker)
+            )
+        return self.pool
+
+    def _pdf_path(self, image_path):
+        return self.output_folder / f"{Path(image_path).stem}.pdf"
+
+    def _convert_to_searchable_pdf(self, image_path):
+        """Converts one image in this process. Returns the PDF path, or None on error."""
+        try:
+            return Path(_ocr_to_pdf(str(image_path), str(self._pdf_path(image_path)), self.passes, self.backend)[0])
+        except Exception as e:
+            print(f"Error processing {Path(image_path).name}: {e}")
+            return None
+
+    def convert_many(self, image_paths):
+        """
+        Converts all images in the process pool.
+        Yields (image_path, pdf_path or None, text or None, error or None) as soon as each one is done.
+        """
+        self.output_folder.mkdir(parents=True, exist_ok=True)
+        pool = self._get_pool()
+        futures = {
+            pool.submit(_ocr_to_pdf, str(path), str(self._pdf_path(path)), self.passes, self.backend): path
+            for path in image_paths
+        }
+        for future in as_completed(futures):
+            image_path = futures[future]
+            try:
+                pdf_path, text, passes_used = future.result()
+                self.stats["converted"] += 1
+                self.stats["escalated"] += passes_used > 1
+                yield image_path, Path(pdf_path), text, None
+            except Exception as e:
+                yield image_path, None, None, e
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+
+def process_receipt_folder(folder_path):
+    valid_extensions = ReceiptProcessor.valid_extensions
+
+    if not os.path.exists(folder_path):
+        print(f"Error: Folder {folder_path} not found.")
+        return
+
+    image_paths = [os.path.join(folder_path, filename) for filename in os.listdir(folder_path)
+                   if filename.lower().endswith(valid_extensions)]
+
+    processor = ReceiptProcessor(TESSERACT_EXE, folder_path)
+    try:
+        for image_path, pdf_path, _, error in processor.convert_many(image_paths):
+            if error:
+                print(f"Error processing {os.path.basename(image_path)}: {error}")
+            else:
+                print(f"   [OK] Converted & Optimized: {pdf_path.name}")
+    finally:
+        processor.close()
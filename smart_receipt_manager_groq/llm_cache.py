@@ -0,0 +1,96 @@
+# File: llm_cache.py
+import sqlite3
+import threading
+import time
+
+
+class LLMCache:
+    """
+    Persistent cache for AI verdicts (SQLite), separate from manual_mappings.json.
+    Key: normalized item name + model name + prompt version.
+    Entries expire after ttl_days and the least recently used are evicted above max_entries
+    (checked on start and every evict_every puts, not on every answer).
+    """
+
+    def __init__(self, db_path, prompt_version, ttl_days=180, max_entries=20000, evict_every=100):
+        self.db_path = db_path
+        self.prompt_version = prompt_version
+        self.ttl = ttl_days * 24 * 3600
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.puts = 0 # Since the last eviction
+        self.lock = threading.Lock() # Worker threads share one connection
+
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        # No fsync per cached answer: a crash loses at most the latest answers, they are asked again
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    name TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    confidence REAL NOT NULL,
+                    created REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (name, model, prompt_version)
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache(created)")
+
+            # A changed prompt makes all older verdicts stale
+            self.conn.execute("DELETE FROM llm_cache WHERE prompt_version != ?", (prompt_version,))
+            self._evict()
+
+    def get(self, name, model_name):
+        """Returns (category, confidence) or None on a miss."""
+        now = time.time()
+        key = (name, model_name, self.prompt_version)
+
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT category, confidence, created FROM llm_cache "
+                "WHERE name = ? AND model = ? AND prompt_version = ?", key
+            ).fetchone()
+            if not row:
+                return None
+
+            category, confidence, created = row
+            if now - created > self.ttl:
+                self.conn.execute(
+                    "DELETE FROM llm_cache WHERE name = ? AND model = ? AND prompt_version = ?", key
+                )
+                return None
+
+            self.conn.execute(
+                "UPDATE llm_cache SET last_used = ? WHERE name = ? AND model = ? AND prompt_version = ?",
+                (now,) + key
+            )
+        return category, confidence
+
+    def put(self, name, model_name, category, confidence):
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (name, model_name, self.prompt_version, category, confidence, now, now)
+            )
+            self.puts += 1
+            if self.puts >= self.evict_every:
+                self._evict()
+
+    def _evict(self):
+        """Drops expired entries and the least recently used ones above max_entries."""
+        self.puts = 0
+        self.conn.execute("DELETE FROM llm_cache WHERE created < ?", (time.time() - self.ttl,))
+
+        count = self.conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if count > self.max_entries:
+            self.conn.execute(
+                "DELETE FROM llm_cache WHERE rowid IN "
+                "(SELECT rowid FROM llm_cache ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,)
+            )
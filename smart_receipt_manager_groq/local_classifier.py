@@ -0,0 +1,119 @@
+# File: local_classifier.py
+import sys
+import zlib
+
+import numpy as np
+
+
+class LocalClassifier:
+    """
+    Offline category classifier trained from our own categorized history.
+    Features: hashed character n-grams of the normalized item name.
+    Model: multinomial logistic regression (softmax), trained with plain NumPy.
+    """
+
+    def __init__(self, n_features=2**15, ngram_range=(2, 4)):
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.categories = []
+        self.weights = None # (n_features, n_categories)
+        self.bias = None # (n_categories,)
+
+    def features(self, clean_name):
+        """Hashed n-gram ids of a normalized name (crc32 is stable across runs, hash() is not)."""
+        padded = f" {clean_name} "
+        low, high = self.ngram_range
+        return np.array([
+            zlib.crc32(padded[i:i + n].encode("utf-8")) % self.n_features
+            for n in range(low, high + 1)
+            for i in range(len(padded) - n + 1)
+        ], dtype=np.int64)
+
+    def train(self, clean_names, labels, epochs=200, learning_rate=20.0, l2=1e-5):
+        """Full-batch gradient descent on the softmax cross-entropy."""
+        self.categories = sorted(set(labels))
+        label_ids = {cat: i for i, cat in enumerate(self.categories)}
+        y = np.array([label_ids[label] for label in labels])
+
+        # Sparse design matrix: all feature ids + one row offset per sample.
+        # Rows are L2-normalized, so long and short names weigh the same.
+        rows = [self.features(name) for name in clean_names]
+        lengths = np.array([len(r) for r in rows])
+        keep = lengths > 0
+        rows, y, lengths = [r for r, k in zip(rows, keep) if k], y[keep], lengths[keep]
+        if not rows:
+            raise ValueError("No training data")
+
+        indices = np.concatenate(rows)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        values = np.repeat(1.0 / np.sqrt(lengths), lengths).astype(np.float32)
+
+        n_samples, n_classes = len(rows), len(self.categories)
+        self.weights = np.zeros((self.n_features, n_classes), dtype=np.float32)
+        self.bias = np.zeros(n_classes, dtype=np.float32)
+        targets = np.zeros((n_samples, n_classes), dtype=np.float32)
+        targets[np.arange(n_samples), y] = 1.0
+
+        for _ in range(epochs):
+            # Forward: logits per sample = bias + sum of weighted n-gram columns
+            contrib = self.weights[indices] * values[:, None]
+            logits = np.add.reduceat(contrib, offsets, axis=0) + self.bias
+            probs = self._softmax(logits)
+
+            # Backward: spread each sample's error over its n-grams
+            error = (probs - targets) / n_samples
+            spread = np.repeat(error, lengths, axis=0) * values[:, None]
+            grad = np.stack([
+                np.bincount(indices, weights=spread[:, c], minlength=self.n_features)
+                for c in range(n_classes)
+            ], axis=1).astype(np.float32)
+            grad += l2 * self.weights
+
+            self.weights -= learning_rate * grad
+            self.bias -= learning_rate * error.sum(axis=0)
+
+    def _softmax(self, logits):
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+    def predict(self, clean_name):
+        """Returns (category, probability), or None for an empty name or untrained model."""
+        if self.weights is None:
+            return None
+
+        feats = self.features(clean_name)
+        if not len(feats):
+            return None
+
+        logits = self.bias + self.weights[feats].sum(axis=0) / np.sqrt(len(feats))
+        probs = self._softmax(logits)
+        best = int(np.argmax(probs))
+        return self.categories[best], float(probs[best])
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            categories=np.array(self.categories),
+            weights=self.weights,
+            bias=self.bias,
+            ngram_range=np.array(self.ngram_range)
+        )
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        model = cls(n_features=data["weights"].shape[0], ngram_range=tuple(int(n) for n in data["ngram_range"]))
+        model.categories = [str(cat) for cat in data["categories"]]
+        model.weights = data["weights"]
+        model.bias = data["bias"]
+        return model
+
+
+if __name__ == "__main__":
+    # Usage: python local_classifier.py train
+    if len(sys.argv) > 1 and sys.argv[1] == "train":
+        from categorizer import ProductCategorizer
+        ProductCategorizer().train_local_classifier()
+    else:
+        print("Usage: python local_classifier.py train")
@@ -1,71 +1,163 @@
-# Smart Receipt V1.5 - Logic Module
-import shutil
-from pathlib import Path
-
-# Custom modules
-import read_receipt
-import clean_data
-import database_manager
-from categorizer import ProductCategorizer
-from path_config import PROCESSED_FOLDER, BASE_DIR
-
-# Initialize AI instance
-print("... Initializing AI Categorizer (Lazy Load) ...")
-ai_boss = ProductCategorizer()
-
-def process_single_file(file_path_str):
-    """
-    Processes a single searchable PDF file: Scan -> Clean -> Filter -> AI -> Save -> Move
-    """
-    file_path = Path(file_path_str)
-    
-    if not file_path.exists():
-        return "Error: File not found"
-
-    print(f"--- Processing: {file_path.name} ---")
-
-    # 1. Scan
-    header_raw, items_raw = read_receipt.scan_receipt(str(file_path))
-    
-    # 2. Data cleaning (8-digit rule for IDs)
-    header_cleaned = clean_data.clean_numbers(header_raw)
-    items_cleaned = clean_data.clean_numbers(items_raw)
-    
-    # 3. Consolidation
-    final_data = clean_data.consolidate_items(items_cleaned)
-
-    # --- VALIDATION ---
-    # Validate ID: exclude "00000000" or "UNKNOWN"
-    extracted_id = header_cleaned[1][0] if len(header_cleaned) > 1 else "UNKNOWN"
-    
-    if "UNKNOWN" in str(extracted_id) or str(extracted_id).startswith("0000") or len(final_data) <= 1:
-        print(f"   [!] ABORT: No valid data found in {file_path.name}.")
-        
-        # Move failed scans to error folder
-        failed_folder = BASE_DIR / "Failed_OCR"
-        failed_folder.mkdir(exist_ok=True)
-        shutil.move(str(file_path), str(failed_folder / file_path.name))
-        return "Failed: No data recognized"
-
-    # 4. AI Categorization
-    for row in final_data[1:]:
-        item_name = row[1]
-        if item_name:
-            category, confidence = ai_boss.get_category(item_name)
-            if confidence < 0.75:
-                row[4] = "UNCATEGORIZED"
-            else:
-                row[4] = category
-
-    # 5. Save
-    database_manager.save_to_csv(header_cleaned, final_data)
-
-    # 6. Move (Success)
-    PROCESSED_FOLDER.mkdir(parents=True, exist_ok=True)
-    destination = PROCESSED_FOLDER / file_path.name
-    
-    if destination.exists():
-        destination.unlink() 
-        
-    shutil.move(str(file_path), str(destination))
-    return "Processed & Moved ✅"
+# Smart Receipt V1.5 - Logic Module
+import shutil
+import threading
+from pathlib import Path
+
+# Custom modules
+import read_receipt
+import clean_data
+import database_manager
+from categorizer import ProductCategorizer
+from circuit_breaker import Deadline
+from path_config import PROCESSED_FOLDER, BASE_DIR
+
+# AI instance, created on first use: the OCR pool processes re-import this module on Windows
+# and must not open the cache or compact the mapping journal
+ai_boss = None
+_ai_boss_lock = threading.Lock()
+
+# PDF path -> Tesseract text of the images imported in this session (no PDF text extraction needed)
+ocr_texts = {}
+
+def get_ai_boss():
+    """The shared categorizer (created on the first call)."""
+    global ai_boss
+    with _ai_boss_lock:
+        if ai_boss is None:
+            print("... Initializing AI Categorizer (Lazy Load) ...")
+            ai_boss = ProductCategorizer()
+    return ai_boss
+
+def prepare_file(file_path):
+    """
+    Scan -> Clean -> Filter for one PDF.
+    Returns (header, items) or a status message if the file could not be used.
+    """
+    if not file_path.exists():
+        return "Error: File not found"
+
+    print(f"--- Processing: {file_path.name} ---")
+
+    # 1. Scan
+    header_raw, items_raw = read_receipt.scan_receipt(str(file_path), ocr_texts.pop(str(file_path), None))
+    
+    # 2. Data cleaning (8-digit rule for IDs)
+    header_cleaned = clean_data.clean_numbers(header_raw)
+    items_cleaned = clean_data.clean_numbers(items_raw)
+    
+    # 3. Consolidation
+    final_data = clean_data.consolidate_items(items_cleaned)
+
+    # --- VALIDATION ---
+    # Validate ID: exclude "00000000" or "UNKNOWN"
+    extracted_id = header_cleaned[1][0] if len(header_cleaned) > 1 else "UNKNOWN"
+    
+    if "UNKNOWN" in str(extracted_id) or str(extracted_id).startswith("0000") or len(final_data) <= 1:
+        print(f"   [!] ABORT: No valid data found in {file_path.name}.")
+        
+        # Move failed scans to error folder
+        failed_folder = BASE_DIR / "Failed_OCR"
+        failed_folder.mkdir(exist_ok=True)
+        shutil.move(str(file_path), str(failed_folder / file_path.name))
+        return "Failed: No data recognized"
+
+    return header_cleaned, final_data
+
+def apply_category(row, category, confidence):
+    """Writes an AI result into an item row (low confidence -> UNCATEGORIZED)."""
+    if confidence < 0.75:
+        row[4] = "UNCATEGORIZED"
+    else:
+        row[4] = category
+
+def finish_file(file_path, header_cleaned, final_data):
+    """Save -> Move for one categorized receipt."""
+    # 5. Save
+    database_manager.save_to_csv(header_cleaned, final_data)
+
+    # 6. Move (Success)
+    PROCESSED_FOLDER.mkdir(parents=True, exist_ok=True)
+    destination = PROCESSED_FOLDER / file_path.name
+    
+    if destination.exists():
+        destination.unlink() 
+        
+    shutil.move(str(file_path), str(destination))
+    return "Processed & Moved ✅"
+
+def process_single_file(file_path_str):
+    """
+    Processes a single searchable PDF file: Scan -> Clean -> Filter -> AI -> Save -> Move
+    """
+    file_path = Path(file_path_str)
+
+    prepared = prepare_file(file_path)
+    if isinstance(prepared, str):
+        return prepared
+    header_cleaned, final_data = prepared
+
+    # 4. AI Categorization (one batched request per receipt, one shared time budget)
+    ai_boss = get_ai_boss()
+    item_rows = [row for row in final_data[1:] if row[1]]
+    results = ai_boss.get_categories([row[1] for row in item_rows], Deadline(ai_boss.receipt_budget))
+
+    for row, (category, confidence) in zip(item_rows, results):
+        apply_category(row, category, confidence)
+
+    return finish_file(file_path, header_cleaned, final_data)
+
+def process_batch(file_path_strs, on_result=None):
+    """
+    Processes several PDFs at once: all files are scanned first, then every distinct
+    (normalized) item name of the whole batch is categorized exactly once.
+    on_result(index, message) is called as soon as a file is done.
+    Returns (messages, saved_lookups).
+    """
+    messages = [None] * len(file_path_strs)
+    prepared = [] # (index, file_path, header, items)
+
+    def report(index, message):
+        messages[index] = message
+        if on_result: on_result(index, message)
+
+    # 1. - 3. Scan and clean all files
+    for index, file_path_str in enumerate(file_path_strs):
+        file_path = Path(file_path_str)
+        try:
+            result = prepare_file(file_path)
+        except Exception as e:
+            print(f"   [!] Error in {file_path.name}: {e}")
+            result = f"Error: {e}"
+
+        if isinstance(result, str):
+            report(index, result)
+        else:
+            prepared.append((index, file_path) + result)
+
+    # 4. AI Categorization: one lookup per distinct normalized name
+    ai_boss = get_ai_boss()
+    item_rows = [row for entry in prepared for row in entry[3][1:] if row[1]]
+    distinct = {} # Normalized name -> name sent to the categorizer
+    for row in item_rows:
+        key = ai_boss.normalize(row[1])
+        # Prefer a spelling the user has corrected before (memory is an exact lookup)
+        if key not in distinct or row[1] in ai_boss.manual_mappings:
+            distinct[key] = row[1]
+
+    deadline = Deadline(ai_boss.receipt_budget * max(1, len(prepared))) # Same budget per receipt as single files
+    answers = dict(zip(distinct, ai_boss.get_categories(list(distinct.values()), deadline)))
+    for row in item_rows:
+        apply_category(row, *answers[ai_boss.normalize(row[1])])
+
+    saved_lookups = len(item_rows) - len(distinct)
+    print(f"Batch dedup: {len(item_rows)} items -> {len(distinct)} distinct names ({saved_lookups} lookups saved).")
+
+    # 5. + 6. Save and move every file
+    for index, file_path, header_cleaned, final_data in prepared:
+        try:
+            report(index, finish_file(file_path, header_cleaned, final_data))
+        except Exception as e:
+            print(f"   [!] Error in {file_path.name}: {e}")
+            report(index, f"Error: {e}")
+
+    return messages, saved_lookups
@@ -0,0 +1,148 @@
+# File: ocr_benchmark.py
+# OCR throughput benchmark of ReceiptProcessor.convert_many.
+# Works on copies of the sample images in a temp folder, the originals are never touched.
+# - default: growing pool sizes, expect near-linear scaling up to the number of physical cores
+#   (os.cpu_count() counts logical ones)
+# - --compare: seconds per image and parsed receipts with full-resolution images vs. the preprocessing stage
+# - --profiles: seconds per image, readable receipts (date + items parsed) and second passes per OCR profile
+# - --backends: tesseract.exe per image vs. a resident tesserocr engine per pool process (speed and parsed receipts)
+#
+# Usage:
+#   python ocr_benchmark.py path/to/sample_images --workers 1,2,4,8 --repeat 2
+#   python ocr_benchmark.py path/to/phone_photos --compare --workers 1 [--deskew] [--binarize]
+#   python ocr_benchmark.py path/to/sample_images --profiles adaptive,fast,best
+#   python ocr_benchmark.py path/to/sample_images --backends cli,tesserocr
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import read_receipt
+from jpg_png_2_pdf import OCR_BACKENDS, ReceiptProcessor, default_backend, resolve_backend
+from ocr_profiles import OCR_PROFILES, default_profile_name
+from path_config import TESSERACT_EXE
+
+FULL_RESOLUTION = {"target_width": None, "crop": False} # Pipeline before the preprocessing stage
+
+
+def run_once(samples, workers, repeat, tesseract_exe, profile=None, preprocessing=None, backend="cli"):
+    """
+    Converts repeat x samples with a pool of the given size (None = sized by the profile).
+    Returns (seconds, failures, parsed, escalated): parsed = receipts with a date and at least one item,
+    escalated = receipts that needed the second OCR pass.
+    """
+    folder = Path(tempfile.mkdtemp(prefix="ocr_bench_"))
+    try:
+        images = []
+        for run in range(repeat):
+            for sample in samples:
+                target = folder / f"{run}_{sample.name}"
+                shutil.copy(sample, target)
+                images.append(target)
+
+        processor = ReceiptProcessor(tesseract_exe, folder, max_workers=workers, profile=profile,
+                                     preprocessing=preprocessing, backend=backend)
+        failures = 0
+        texts = []
+        start = time.perf_counter()
+        try:
+            for _, pdf_path, text, error in processor.convert_many(images):
+                if error:
+                    failures += 1
+                    print(f"   [!] OCR Error: {error}")
+                else:
+                    texts.append(text)
+        finally:
+            processor.close() # Pool start-up is part of the measurement
+        seconds = time.perf_counter() - start
+        return seconds, failures, sum(1 for text in texts if is_parsed(text)), processor.stats["escalated"]
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def is_parsed(text):
+    """True if the parser finds a date and at least one item in the OCR text."""
+    header, items = read_receipt.scan_receipt(None, text)
+    return not header[1][1].startswith("0000") and len(items) > 1
+
+
+def main():
+    cores = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+
+    parser = argparse.ArgumentParser(description="OCR scaling benchmark of the import step.")
+    parser.add_argument("samples", help="Folder with sample receipt images (.png/.jpg)")
+    parser.add_argument("--workers", default=",".join(map(str, default_workers)),
+                        help="Comma separated pool sizes to measure")
+    parser.add_argument("--repeat", type=int, default=1, help="How often every sample is converted per run")
+    parser.add_argument("--tesseract", default=str(TESSERACT_EXE), help="Tesseract executable")
+    parser.add_argument("--profile", default=default_profile_name(), choices=list(OCR_PROFILES), help="OCR profile")
+    parser.add_argument("--compare", action="store_true", help="Full resolution vs. preprocessing stage")
+    parser.add_argument("--profiles", help="Comma separated OCR profiles to compare, e.g. fast,best")
+    parser.add_argument("--backend", default=default_backend(), choices=OCR_BACKENDS,
+                        help="OCR backend (default: OCR_BACKEND environment variable, else cli)")
+    parser.add_argument("--backends", help="Comma separated OCR backends to compare, e.g. cli,tesserocr")
+    parser.add_argument("--deskew", action="store_true", help="Preprocessing: straighten rotated photos")
+    parser.add_argument("--binarize", action="store_true", help="Preprocessing: adaptive binarization")
+    args = parser.parse_args()
+
+    samples = sorted(p for p in Path(args.samples).iterdir() if p.suffix.lower() in ReceiptProcessor.valid_extensions)
+    if not samples:
+        print(f"No images found in {args.samples}")
+        return
+
+    count = len(samples) * args.repeat
+    print(f"{count} images per run, {cores} logical cores\n")
+    # None = preprocessing of the profile
+    preprocessing = {"deskew": args.deskew, "binarize": args.binarize} if args.deskew or args.binarize else None
+
+    if args.backends:
+        print(f"{'backend':>9} {'s/image':>8} {'img/s':>7} {'speedup':>8} {'parsed':>7}")
+        baseline = None
+        for name in args.backends.split(","):
+            if resolve_backend(name) != name:
+                print(f"{name:>9} not available")
+                continue
+            # Parsed receipts should match tesseract.exe before the resident engine can become the default
+            seconds, failures, parsed, _ = run_once(samples, None, args.repeat, args.tesseract, args.profile, preprocessing, name)
+            baseline = baseline or seconds
+            print(f"{name:>9} {seconds / count:>8.3f} {count / seconds:>7.2f} {baseline / seconds:>7.2f}x {parsed:>3}/{count}"
+                  + (f"  ({failures} failed)" if failures else ""))
+        return
+
+    if args.profiles:
+        print(f"{'profile':>8} {'s/image':>8} {'img/s':>7} {'parsed':>7} {'2nd pass':>8}")
+        for name in args.profiles.split(","):
+            seconds, failures, parsed, escalated = run_once(samples, None, args.repeat, args.tesseract, name, preprocessing, args.backend)
+            print(f"{name:>8} {seconds / count:>8.3f} {count / seconds:>7.2f} {parsed:>3}/{count} {escalated:>8}"
+                  + (f"  ({failures} failed)" if failures else ""))
+        return
+
+    if args.compare:
+        workers = int(args.workers.split(",")[0])
+        print(f"{'pipeline':>16} {'s/image':>8} {'speedup':>8} {'parsed':>7}")
+        baseline = None
+        for label, options in (("full resolution", FULL_RESOLUTION), ("preprocessed", preprocessing)):
+            # Faster only counts if the preprocessed images are read as well as the full-resolution ones
+            seconds, failures, parsed, _ = run_once(samples, workers, args.repeat, args.tesseract, args.profile, options, args.backend)
+            baseline = baseline or seconds
+            print(f"{label:>16} {seconds / count:>8.3f} {baseline / seconds:>7.2f}x {parsed:>3}/{count}"
+                  + (f"  ({failures} failed)" if failures else ""))
+        return
+
+    print(f"{'workers':>7} {'seconds':>8} {'img/s':>7} {'speedup':>8} {'efficiency':>10}")
+
+    single = None # Throughput of one worker (exact if the first run uses 1 worker)
+    for workers in (int(w) for w in args.workers.split(",")):
+        seconds, failures, _, _ = run_once(samples, workers, args.repeat, args.tesseract, args.profile, preprocessing, args.backend)
+        rate = count / seconds
+        single = single or rate / workers
+        speedup = rate / single
+        print(f"{workers:>7} {seconds:>8.2f} {rate:>7.2f} {speedup:>7.2f}x {speedup / workers:>9.0%}"
+              + (f"  ({failures} failed)" if failures else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# File: ollama_backend.py
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import rules_config
+from circuit_breaker import BudgetExhausted, NO_DEADLINE
+
+# Same compact protocol as the Ollama version: numbered categories in a fixed system message,
+# the answer is only the category number (enforced by the format schema).
+SYSTEM_PROMPT = (
+    "You are an expert for German supermarket products.\n"
+    "Categories:\n"
+    + "\n".join(f"{i}: {cat}" for i, cat in enumerate(rules_config.CATEGORIES))
+    + "\n\nSpecific rules:\n"
+    '- "Passierte Tomaten" always belongs to "Pantry & Cooking".\n'
+    '- "Baguette" always belongs to "Breakfast & Bakery".\n'
+    "- Pay attention to brand names and typical German abbreviations.\n"
+    "\nThe user sends one item name. "
+    'Answer ONLY with JSON containing its category number, e.g. {"c": 4}'
+)
+ANSWER_SCHEMA = {
+    "type": "object",
+    "properties": {"c": {"type": "integer", "minimum": 0, "maximum": len(rules_config.CATEGORIES) - 1}},
+    "required": ["c"]
+}
+
+
+class OllamaBackend:
+    """
+    Optional local model (Ollama) as second AI backend next to Groq.
+    If the server is not reachable, the backend switches itself off for this run.
+    """
+
+    def __init__(self, model_name="llama3.1:latest", keep_alive="30m"):
+        self.host = self.ollama_host()
+        self.api_url = f"{self.host}/api/generate"
+        self.model_name = model_name
+        self.keep_alive = keep_alive
+        self.enabled = True
+
+        self.num_parallel = int(os.environ.get("OLLAMA_NUM_PARALLEL", 4))
+        self.executor = ThreadPoolExecutor(max_workers=self.num_parallel, thread_name_prefix="ollama")
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=self.num_parallel))
+
+    def ollama_host(self):
+        """Server URL from OLLAMA_HOST (same format as the Ollama CLI), default localhost:11434."""
+        host = os.environ.get("OLLAMA_HOST", "").strip() or "localhost:11434"
+        if "://" not in host:
+            host = f"http://{host}"
+        host = host.rstrip("/").replace("0.0.0.0", "localhost") # Bind address of the server
+        if host.count(":") < 2:
+            host += ":11434"
+        return host
+
+    def ask(self, original_name, deadline=NO_DEADLINE):
+        """Returns (category, 0.95), or ("UNCATEGORIZED", 0.0) on any error. BudgetExhausted after the deadline."""
+        if not self.enabled:
+            return "UNCATEGORIZED", 0.0
+        if deadline.expired():
+            raise BudgetExhausted("Time budget exhausted")
+
+        payload = {
+            "model": self.model_name,
+            "system": SYSTEM_PROMPT,
+            "prompt": original_name,
+            "format": ANSWER_SCHEMA,
+            "stream": False,
+            "keep_alive": self.keep_alive,
+            "options": {
+                "temperature": 0.0,
+                "num_predict": 8 # {"c": 12}
+            }
+        }
+
+        try:
+            response = self.session.post(self.api_url, json=payload, timeout=deadline.timeout(15))
+            if response.status_code == 404:
+                print(f"   [!] Ollama model {self.model_name} not installed, local backend disabled.")
+                self.enabled = False
+            if response.status_code != 200:
+                return "UNCATEGORIZED", 0.0
+
+            answer = json.loads(response.json().get("response", ""))
+            number = answer.get("c") if isinstance(answer, dict) else None
+            if type(number) is int and 0 <= number < len(rules_config.CATEGORIES):
+                return rules_config.CATEGORIES[number], 0.95
+            return "UNCATEGORIZED", 0.0
+        except requests.RequestException as e:
+            if deadline.expired():
+                raise BudgetExhausted("Time budget exhausted during the request") from e # Timeout capped by the budget
+            if isinstance(e, requests.ConnectionError):
+                print(f"   [!] Ollama not reachable at {self.host}, local backend disabled.")
+                self.enabled = False
+            else:
+                print(f"   [!] Ollama Error: {e}")
+            return "UNCATEGORIZED", 0.0
+        except Exception as e:
+            print(f"   [!] Ollama Error: {e}")
+            return "UNCATEGORIZED", 0.0
+
+    def ask_batch(self, original_names, deadline=NO_DEADLINE):
+        """One request per name, up to num_parallel at a time. BudgetExhausted if the deadline ran out before any answer."""
+        def ask_one(name):
+            try:
+                return self.ask(name, deadline)
+            except BudgetExhausted:
+                return None
+
+        results = list(self.executor.map(ask_one, original_names))
+        if None in results and not any(r and r[1] > 0 for r in results):
+            raise BudgetExhausted("Time budget exhausted")
+        return [r or ("UNCATEGORIZED", 0.0) for r in results]
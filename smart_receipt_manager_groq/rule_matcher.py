@@ -0,0 +1,87 @@
+# File: rule_matcher.py
+from collections import deque
+
+import rules_config  # FALSE_FRIENDS, HARDCODED_RULES
+
+
+class RuleMatcher:
+    """
+    Aho-Corasick automaton over all keywords of rules_config.
+    Finds the highest-priority rule in a single pass over the name.
+    Priority: FALSE_FRIENDS first, then HARDCODED_RULES in dict order.
+    """
+
+    def __init__(self, false_friends=None, hardcoded_rules=None):
+        if false_friends is None:
+            false_friends = rules_config.FALSE_FRIENDS
+        if hardcoded_rules is None:
+            hardcoded_rules = rules_config.HARDCODED_RULES
+
+        # Keyword -> (priority, category). First occurrence wins.
+        self.priorities = {}
+        for word, category in false_friends.items():
+            self._add_keyword(word, category)
+        for category, keywords in hardcoded_rules.items():
+            for kw in keywords:
+                self._add_keyword(kw, category)
+
+        self._build()
+
+    def _add_keyword(self, keyword, category):
+        keyword = keyword.lower()
+        if keyword and keyword not in self.priorities:
+            self.priorities[keyword] = (len(self.priorities), category)
+
+    def _build(self):
+        """Builds the trie, failure links and merged outputs."""
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [None] # Best (priority, category) ending in this state
+
+        # 1. Trie
+        for keyword, hit in self.priorities.items():
+            state = 0
+            for ch in keyword:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(None)
+                    nxt = len(self.goto) - 1
+                    self.goto[state][ch] = nxt
+                state = nxt
+            self.output[state] = hit
+
+        # 2. Failure links (BFS), inheriting the best output of the suffix state
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+
+                inherited = self.output[self.fail[nxt]]
+                if inherited and (self.output[nxt] is None or inherited[0] < self.output[nxt][0]):
+                    self.output[nxt] = inherited
+
+    def match(self, clean_name):
+        """Returns the category of the highest-priority keyword in clean_name, or None."""
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        best = None
+
+        for ch in clean_name:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            hit = output[state]
+            if hit and (best is None or hit[0] < best[0]):
+                best = hit
+                if best[0] == 0:
+                    break # Nothing beats the first rule
+
+        return best[1] if best else None
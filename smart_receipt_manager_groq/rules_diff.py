@@ -0,0 +1,143 @@
+# File: rules_diff.py
+import csv
+import hashlib
+import json
+import os
+import sys
+
+from path_config import CSV_FOLDER
+from rule_matcher import RuleMatcher
+from database_manager import update_item_categories
+
+
+class RulesDiff:
+    """
+    Re-categorizes only the rows affected by a change in rules_config.
+    - a hash and a snapshot of the rules (keyword -> category) are stored next to the CSV files
+    - changed keywords are the ones added, removed or moved to another category since the last run
+    - an inverted index keyword -> (partition, row) finds the affected rows in one scan
+    - affected rows get the local category (rules, memory, classifier, LLM cache), never a new AI call
+    - rows the user corrected (manual mappings) keep their category
+    - without a snapshot (first run) only the snapshot is written, check_all re-checks every keyword once
+    - only partitions with changed rows are rewritten, each one once
+    """
+
+    def __init__(self, categorizer):
+        self.categorizer = categorizer
+        self.state_file = CSV_FOLDER / "rules_state.json"
+
+    def current_keywords(self):
+        """Keyword -> category in priority order. Also recompiles the categorizer's matcher."""
+        self.categorizer.rule_matcher = RuleMatcher()
+        return {keyword: category for keyword, (_, category) in self.categorizer.rule_matcher.priorities.items()}
+
+    def rules_hash(self, keywords):
+        return hashlib.sha1(json.dumps(list(keywords.items()), ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def changed_keywords(self, old, new):
+        """Keywords that were added, removed or point to another category."""
+        return {keyword for keyword in old.keys() | new.keys() if old.get(keyword) != new.get(keyword)}
+
+    def build_index(self, keywords):
+        """Inverted index: keyword -> [(items_file, data row index, item_name)] for all partitions."""
+        index = {keyword: [] for keyword in keywords}
+        if not index:
+            return index
+        # Same substring semantics as the Aho-Corasick matcher, restricted to the changed keywords
+        matcher = RuleMatcher(false_friends={keyword: keyword for keyword in keywords}, hardcoded_rules={})
+        for items_file in sorted(CSV_FOLDER.glob("items_*.csv")):
+            with open(items_file, mode='r', encoding='utf-8') as f:
+                for row_index, row in enumerate(csv.DictReader(f)):
+                    name = row.get('item_name')
+                    if not name:
+                        continue
+                    clean_name = self.categorizer.normalize(name)
+                    if not matcher.match(clean_name):
+                        continue # Fast path: none of the changed keywords occurs
+                    for keyword in keywords:
+                        if keyword in clean_name:
+                            index[keyword].append((items_file, row_index, name))
+        return index
+
+    def new_category(self, item_name):
+        """Category without asking the AI, UNCATEGORIZED if only the AI could decide."""
+        local = self.categorizer.get_local_category(item_name)
+        if not local:
+            local = self.categorizer.cached_answer(self.categorizer.normalize(item_name))
+        return local[0] if local else "UNCATEGORIZED"
+
+    def run(self, dry_run=False, on_progress=print, check_all=False):
+        """Applies the rule changes since the last run. Returns the number of rewritten rows."""
+        keywords = self.current_keywords()
+        state = self._load_state()
+        if check_all:
+            on_progress("Rules diff: checking all keywords.")
+            changed = set(keywords)
+        elif state is None:
+            # Nothing to compare with: the history may hold corrections that no rule change justifies touching
+            if not dry_run:
+                self._save_state(keywords)
+            on_progress("Rules diff: no previous rules snapshot, saved the current rules. "
+                        "Use --all to re-check the whole history once.")
+            return 0
+        elif state["hash"] == self.rules_hash(keywords):
+            on_progress("Rules diff: rules_config unchanged.")
+            return 0
+        else:
+            changed = self.changed_keywords(state["keywords"], keywords)
+        if not changed:
+            # Same keywords, new order: only rows with several matching keywords can move
+            changed = set(keywords)
+        on_progress(f"Rules diff: {len(changed)} changed keywords: {', '.join(sorted(changed)[:20])}")
+
+        # Group affected rows by partition, every name is decided only once
+        corrected = {self.categorizer.normalize(name) for name in self.categorizer.manual_mappings}
+        updates = {} # items_file -> {row index: category}
+        decided = {} # item_name -> category
+        for keyword, hits in self.build_index(changed).items():
+            for items_file, row_index, name in hits:
+                if self.categorizer.normalize(name) in corrected:
+                    continue # The user's correction beats the rules
+                if name not in decided:
+                    decided[name] = self.new_category(name)
+                updates.setdefault(items_file, {})[row_index] = decided[name]
+
+        total = 0
+        for items_file, categories in sorted(updates.items()):
+            if dry_run:
+                on_progress(f"{items_file.name}: {len(categories)} affected rows.")
+                continue
+            rewritten = update_item_categories(items_file, categories)
+            total += rewritten
+            on_progress(f"{items_file.name}: {len(categories)} affected rows, {rewritten} re-categorized.")
+
+        if not dry_run:
+            self._save_state(keywords)
+        on_progress(f"Rules diff finished: {total} rows re-categorized in {len(updates)} partitions.")
+        return total
+
+    def _load_state(self):
+        if not self.state_file.exists():
+            return None
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if "hash" not in state or "keywords" not in state:
+                raise KeyError("hash/keywords")
+            return state
+        except (OSError, ValueError, KeyError) as e:
+            print(f"   [!] Rules snapshot unreadable, checking all keywords: {e}")
+            return None
+
+    def _save_state(self, keywords):
+        temp_file = f"{self.state_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({"hash": self.rules_hash(keywords), "keywords": keywords}, f, ensure_ascii=False)
+        os.replace(temp_file, self.state_file)
+
+
+if __name__ == "__main__":
+    # Usage: python rules_diff.py [--dry-run] [--all]
+    from categorizer import ProductCategorizer
+    RulesDiff(ProductCategorizer()).run(dry_run="--dry-run" in sys.argv[1:], check_all="--all" in sys.argv[1:])
+    sys.exit(0)
@@ -1,100 +1,458 @@
-import json
-import os
-import requests
-import re
-import rules_config 
-from path_config import INPUT_FOLDER, PROCESSED_FOLDER, CSV_FOLDER
-
-class ProductCategorizer:
-    def __init__(self):
-        self.api_url = "http://localhost:11434/api/generate"
-        self.model_name = "llama3.1:latest"
-        self.mapping_file = CSV_FOLDER / "manual_mappings.json"
-        self.manual_mappings = self.load_mappings()
-
-    def load_mappings(self):
-        """Loads manual corrections from JSON file."""
-        if os.path.exists(self.mapping_file):
-            try:
-                with open(self.mapping_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-
-    def normalize(self, text):
-        """Cleans text for consistent comparisons."""
-        text = text.lower().strip()
-        text = re.sub(r'[^a-z0-9äöüß ]', ' ', text)
-        return " ".join(text.split())
-
-    def get_category(self, item_name):
-        """Priority logic: Rules -> Memory -> AI."""
-        clean_name = self.normalize(item_name)
-
-        # 1. Check False Friends (Top Priority)
-        for word, category in rules_config.FALSE_FRIENDS.items():
-            if word in clean_name:
-                return category, 1.0
-
-        # 2. Check Hardcoded Rules
-        for category, keywords in rules_config.HARDCODED_RULES.items():
-            if any(kw in clean_name for kw in keywords):
-                return category, 1.0
-
-        # 3. Check Manual Memory
-        if item_name in self.manual_mappings:
-            return self.manual_mappings[item_name], 1.0
-
-        # 4. Final step: AI categorization
-        return self.ask_llm(item_name, clean_name)
-
-    def ask_llm(self, original_name, clean_name):
-        """Communicates with local Llama model via Ollama."""
-        category_list = ", ".join(rules_config.CATEGORIES)
-        
-        prompt = f"""
-        You are an expert for German supermarket products.
-        Categorize the following item: "{original_name}"
-        
-        Choose EXACTLY ONE category from this list: {category_list}
-        
-        Specific rules:
-        - "Passierte Tomaten" always belongs to "Pantry & Cooking".
-        - "Baguette" always belongs to "Breakfast & Bakery".
-        - Pay attention to brand names and typical German abbreviations.
-        
-        Return ONLY the exact category name from the list. 
-        No explanations, no introduction, no punctuation.
-        """
-
-        payload = {
-            "model": self.model_name,
-            "prompt": prompt,
-            "stream": False,
-            "options": { 
-                "temperature": 0.0 
-            }
-        }
-
-        try:
-            response = requests.post(self.api_url, json=payload, timeout=15)
-            if response.status_code == 200:
-                ai_response = response.json().get("response", "").strip()
-                
-                # Validation: Does response match our category list?
-                for cat in rules_config.CATEGORIES:
-                    if cat.lower() in ai_response.lower():
-                        return cat, 0.95
-                
-                return "Miscellaneous", 0.70
-            return "UNCATEGORIZED", 0.0
-        except Exception as e:
-            print(f"   [!] AI Error: {e}")
-            return "UNCATEGORIZED", 0.0
-
-    def save_manual_mapping(self, item_name, correct_category):
-        """Saves a manual correction to the mapping file."""
-        self.manual_mappings[item_name] = correct_category
-        with open(self.mapping_file, 'w', encoding='utf-8') as f:
-            json.dump(self.manual_mappings, f, indent=4, ensure_ascii=False)
\ No newline at end of file
+import hashlib
+import json
+import os
+import requests
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+import numpy as np
+import rules_config 
+from path_config import INPUT_FOLDER, PROCESSED_FOLDER, CSV_FOLDER
+from rule_matcher import RuleMatcher
+from llm_cache import LLMCache
+from fuzzy_index import TrigramIndex
+from local_classifier import LocalClassifier
+import database_manager
+from mapping_journal import MappingJournal
+from embedding_index import EmbeddingIndex
+from circuit_breaker import BudgetExhausted, CircuitBreaker, Deadline, NO_DEADLINE
+
+# Compact protocol: the categories are numbered once in a fixed system message (Ollama reuses the
+# evaluated prefix), the model answers with the category number only (enforced by the format schema).
+# Its hash is part of the AI cache key, so editing it invalidates cached answers.
+SYSTEM_PROMPT = (
+    "You are an expert for German supermarket products.\n"
+    "Categories:\n"
+    + "\n".join(f"{i}: {cat}" for i, cat in enumerate(rules_config.CATEGORIES))
+    + "\n\nSpecific rules:\n"
+    '- "Passierte Tomaten" always belongs to "Pantry & Cooking".\n'
+    '- "Baguette" always belongs to "Breakfast & Bakery".\n'
+    "- Pay attention to brand names and typical German abbreviations.\n"
+    "\nThe user sends one item name. "
+    'Answer ONLY with JSON containing its category number, e.g. {"c": 4}'
+)
+ANSWER_SCHEMA = {
+    "type": "object",
+    "properties": {"c": {"type": "integer", "minimum": 0, "maximum": len(rules_config.CATEGORIES) - 1}},
+    "required": ["c"]
+}
+
+class ProductCategorizer:
+    def __init__(self):
+        self.host = self.ollama_host() # fake_llm_server.py for offline runs
+        self.api_url = f"{self.host}/api/generate"
+        self.model_name = "llama3.1:latest"
+        self.keep_alive = "30m" # Keep the model loaded between receipts
+        self.stream = True # Read tokens as they come and hang up once the category is certain
+
+        # Model cascade: the small model answers first. The next tier is only asked if the answer is
+        # no valid category number or its probability (Ollama logprobs) is below min_probability.
+        self.model_cascade = [
+            {"model": "llama3.2:3b", "min_probability": 0.80},
+            {"model": self.model_name, "min_probability": 0.0} # Last tier always decides
+        ]
+        self.unsure_confidence = 0.5 # Rejected answer of a smaller tier: below main.apply_category's 0.75
+        self.tier_stats = {} # Model -> {"asked", "accepted", "seconds"}
+        self.stats_lock = threading.Lock()
+
+        # Failures must cost milliseconds: a shared time budget per receipt and a breaker for the server.
+        # Items that could not be asked are marked UNCATEGORIZED, the backfill job (backfill.py) finds
+        # them in the CSV files and asks again later.
+        self.receipt_budget = 60.0 # Seconds of AI time per receipt (CPU-only boxes are slow)
+        self.breaker = CircuitBreaker("Ollama")
+
+        # Parallel requests, matched to the server's OLLAMA_NUM_PARALLEL
+        self.num_parallel = int(os.environ.get("OLLAMA_NUM_PARALLEL", 4))
+        self.executor = ThreadPoolExecutor(max_workers=self.num_parallel, thread_name_prefix="ollama")
+
+        # Pooled HTTP session: one TCP connection per parallel slot, reused for every item
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=self.num_parallel))
+
+        self.mapping_file = CSV_FOLDER / "manual_mappings.json"
+        self.mapping_journal = MappingJournal(self.mapping_file, CSV_FOLDER / "manual_mappings.jsonl")
+        self.manual_mappings = self.load_mappings()
+
+        # Fuzzy memory: similar spellings (OCR variants) resolve to the same correction.
+        # Keep the threshold >= 0.75, the similarity is returned as confidence.
+        self.mapping_index = TrigramIndex(threshold=0.75)
+        for name, category in self.manual_mappings.items():
+            self.mapping_index.add(self.normalize(name), category)
+
+        # Offline classifier between memory and AI (train: python local_classifier.py train)
+        self.classifier_file = CSV_FOLDER / "local_classifier.npz"
+        self.classifier_threshold = 0.85 # Below this, the AI decides
+        self.local_classifier = self.load_local_classifier()
+
+        self.rule_matcher = RuleMatcher() # Compiled once from rules_config
+        self.llm_cache = LLMCache(CSV_FOLDER / "llm_cache.sqlite", self.prompt_version())
+
+        # Semantic tier: k nearest already categorized names (build: python embedding_index.py build)
+        self.embed_url = f"{self.host}/api/embed"
+        self.embedding_model = "nomic-embed-text"
+        self.embedding_k = 5
+        self.embedding_threshold = 0.88 # Cosine similarity, returned as confidence
+        self.embedding_index = EmbeddingIndex(CSV_FOLDER, self.embedding_model)
+        self.embeddings_enabled = True # Switched off for this run if the model is missing
+
+    def ollama_host(self):
+        """Server URL from OLLAMA_HOST (same format as the Ollama CLI), default localhost:11434."""
+        host = os.environ.get("OLLAMA_HOST", "").strip() or "localhost:11434"
+        if "://" not in host:
+            host = f"http://{host}"
+        host = host.rstrip("/").replace("0.0.0.0", "localhost") # Bind address of the server
+        if host.count(":") < 2:
+            host += ":11434"
+        return host
+
+    def prompt_version(self):
+        """Short hash over prompt and category list (part of the AI cache key)."""
+        source = SYSTEM_PROMPT + json.dumps(ANSWER_SCHEMA)
+        return hashlib.sha1(source.encode("utf-8")).hexdigest()[:12]
+
+    def load_mappings(self):
+        """Loads manual corrections (snapshot + journal)."""
+        mappings = self.mapping_journal.load()
+        if self.mapping_journal.needs_compaction():
+            self.mapping_journal.compact(mappings)
+        return mappings
+
+    def load_local_classifier(self):
+        if self.classifier_file.exists():
+            try:
+                return LocalClassifier.load(self.classifier_file)
+            except Exception as e:
+                print(f"   [!] Could not load local classifier: {e}")
+        return None
+
+    def train_local_classifier(self):
+        """Trains the offline classifier from the CSV database and the manual mappings."""
+        samples = database_manager.load_categorized_items() + list(self.manual_mappings.items())
+        samples = [(self.normalize(name), cat) for name, cat in samples if cat in rules_config.CATEGORIES]
+
+        if len({cat for _, cat in samples}) < 2:
+            print("Not enough categorized items to train the local classifier.")
+            return False
+
+        model = LocalClassifier()
+        model.train([name for name, _ in samples], [cat for _, cat in samples])
+        model.save(self.classifier_file)
+        self.local_classifier = model
+
+        print(f"Local classifier trained on {len(samples)} items ({len(model.categories)} categories).")
+        return True
+
+    def normalize(self, text):
+        """Cleans text for consistent comparisons."""
+        text = text.lower().strip()
+        text = re.sub(r'[^a-z0-9äöüß ]', ' ', text)
+        return " ".join(text.split())
+
+    def get_local_category(self, item_name):
+        """Rules, memory and offline classifier. Returns None if the AI is needed."""
+        if not item_name:
+            return "UNCATEGORIZED", 0.0
+
+        clean_name = self.normalize(item_name)
+
+        # 1. + 2. Check False Friends (Top Priority), then Hardcoded Rules
+        category = self.rule_matcher.match(clean_name)
+        if category:
+            return category, 1.0
+
+        # 3. Check Manual Memory (exact, then similar spellings)
+        if item_name in self.manual_mappings:
+            return self.manual_mappings[item_name], 1.0
+
+        fuzzy = self.mapping_index.lookup(clean_name)
+        if fuzzy:
+            return fuzzy
+
+        # 4. Check offline classifier (confident predictions only)
+        if self.local_classifier:
+            prediction = self.local_classifier.predict(clean_name)
+            if prediction and prediction[1] >= self.classifier_threshold:
+                return prediction
+
+        return None
+
+    def get_category(self, item_name):
+        """Priority logic: Rules -> Memory -> Classifier -> Cache -> Neighbours -> AI."""
+        return self.get_categories([item_name])[0]
+
+    def get_categories(self, item_names, deadline=None):
+        """
+        Batch version of get_category for a whole receipt.
+        Unknown names are embedded in one request and matched against known neighbours.
+        Each remaining name is asked once, up to num_parallel requests at a time.
+        All AI calls share one Deadline (default: receipt_budget seconds from now).
+        """
+        deadline = deadline or Deadline(self.receipt_budget)
+        results = [None] * len(item_names)
+        pending = {} # Name -> list of indices
+
+        for i, name in enumerate(item_names):
+            local = self.get_local_category(name)
+
+            # 5. Check cache of earlier AI answers
+            if not local and name not in pending:
+                local = self.cached_answer(self.normalize(name))
+
+            if local:
+                results[i] = local
+            else:
+                pending.setdefault(name, []).append(i)
+
+        # 6. Nearest neighbours among already categorized names
+        names = list(pending)
+        clean_names = [self.normalize(name) for name in names]
+        vectors = self.embed(clean_names, deadline) if names and not self.breaker.is_open() else None
+
+        answers = {}
+        if vectors is not None:
+            hits = self.embedding_index.query(vectors, self.embedding_k, self.embedding_threshold)
+            for name, hit in zip(names, hits):
+                if hit:
+                    answers[name] = hit
+
+        # 7. Final step: AI categorization (only genuinely novel products)
+        novel = [name for name in names if name not in answers]
+        answers.update(zip(novel, self.executor.map(lambda name: self._ask_and_cache(name, deadline), novel)))
+        if novel:
+            print(self.cascade_report())
+
+        # New AI verdicts become neighbours for the next receipts
+        if vectors is not None:
+            learned = [i for i, name in enumerate(names) if name in novel and answers[name][1] >= 0.75]
+            if learned:
+                self.embedding_index.add(
+                    [clean_names[i] for i in learned], vectors[learned], [answers[names[i]][0] for i in learned]
+                )
+
+        for name, answer in answers.items():
+            for i in pending[name]:
+                results[i] = answer
+
+        return results
+
+    def embed(self, texts, deadline=NO_DEADLINE):
+        """Embeds several texts with one Ollama request. Returns a NumPy matrix or None."""
+        if not self.embeddings_enabled or not texts or deadline.expired():
+            return None
+
+        payload = {"model": self.embedding_model, "input": texts, "keep_alive": self.keep_alive}
+        try:
+            response = self.session.post(self.embed_url, json=payload, timeout=deadline.timeout(30))
+            if response.status_code == 200:
+                return np.array(response.json()["embeddings"], dtype=np.float32)
+
+            print(f"   [!] Embedding model unavailable ({response.status_code}), neighbour tier disabled.")
+            self.embeddings_enabled = False
+        except Exception as e:
+            print(f"   [!] Embedding Error: {e}")
+        return None
+
+    def build_embedding_index(self, batch_size=64):
+        """Embeds all categorized names of the CSV database that are not in the index yet."""
+        known = {}
+        for name, category in database_manager.load_categorized_items():
+            clean_name = self.normalize(name)
+            if category in rules_config.CATEGORIES and clean_name not in self.embedding_index:
+                known[clean_name] = category
+
+        names = list(known)
+        for start in range(0, len(names), batch_size):
+            chunk = names[start:start + batch_size]
+            vectors = self.embed(chunk)
+            if vectors is None:
+                print("   [!] Embedding index build aborted.")
+                return False
+            self.embedding_index.add(chunk, vectors, [known[name] for name in chunk])
+            print(f"Embedded {min(start + batch_size, len(names))}/{len(names)} names.")
+
+        print(f"Embedding index contains {len(self.embedding_index)} names.")
+        return True
+
+    def cached_answer(self, clean_name):
+        """Earlier AI verdict for a name, the biggest model's first. None on a miss."""
+        for tier in reversed(self.model_cascade):
+            cached = self.llm_cache.get(clean_name, tier["model"])
+            if cached:
+                return cached
+        return None
+
+    def _ask_and_cache(self, item_name, deadline=NO_DEADLINE):
+        # Budget spent or server paused: give up at once instead of waiting for a timeout
+        if deadline.expired() or not self.breaker.allow():
+            return "UNCATEGORIZED", 0.0
+
+        clean_name = self.normalize(item_name)
+        try:
+            category, confidence, model = self.ask_llm(item_name, clean_name, deadline)
+        except BudgetExhausted:
+            self.breaker.release() # Out of time is not a server failure
+            return "UNCATEGORIZED", 0.0
+        if confidence > 0:
+            self.breaker.record_success()
+            # Only accepted answers are cached, under the tier that gave them. Errors and unsure answers are asked again
+            if confidence > self.unsure_confidence:
+                self.llm_cache.put(clean_name, model, category, confidence)
+        else:
+            self.breaker.record_failure()
+        return category, confidence
+
+    def warm_up(self):
+        """Loads the cascade's models into memory (empty prompt), so the first receipt skips the cold start."""
+        for tier in self.model_cascade:
+            payload = {"model": tier["model"], "keep_alive": self.keep_alive}
+            try:
+                self.session.post(self.api_url, json=payload, timeout=120)
+            except Exception as e:
+                print(f"   [!] AI Warm-up Error ({tier['model']}): {e}")
+
+    def ask_llm(self, original_name, clean_name, deadline=NO_DEADLINE):
+        """
+        Communicates with the local models via Ollama, escalating through the model cascade.
+        Returns (category, confidence, model that answered). BudgetExhausted if the deadline ran out first.
+        """
+        fallback = None # (category, model) of the first rejected answer
+        for level, tier in enumerate(self.model_cascade):
+            if tier.get("missing"):
+                continue
+            if deadline.expired():
+                break
+            start = time.perf_counter()
+            try:
+                category, probability = self._ask_model(tier, original_name, deadline)
+            except BudgetExhausted:
+                break
+            last = level == len(self.model_cascade) - 1
+            accepted = bool(category) and (last or probability is None or probability >= tier["min_probability"])
+            self._record_tier(tier["model"], accepted, time.perf_counter() - start)
+
+            if accepted:
+                return category, 0.95, tier["model"]
+            if category and not fallback:
+                fallback = (category, tier["model"])
+
+        # The big model failed: keep the unsure answer of a smaller one, but below the cut-off
+        if fallback:
+            return fallback[0], self.unsure_confidence, fallback[1]
+        if deadline.expired():
+            raise BudgetExhausted("Time budget exhausted")
+        return "UNCATEGORIZED", 0.0, None
+
+    def _ask_model(self, tier, original_name, deadline=NO_DEADLINE):
+        """One request to one cascade tier. Returns (category or None, probability or None)."""
+        model = tier["model"]
+        payload = {
+            "model": model,
+            "system": SYSTEM_PROMPT,
+            "prompt": original_name,
+            "format": ANSWER_SCHEMA,
+            "stream": self.stream,
+            "logprobs": True, # Ignored by older Ollama versions (probability is then None)
+            "keep_alive": self.keep_alive,
+            "options": { 
+                "temperature": 0.0,
+                "num_predict": 8 # {"c": 12}
+            }
+        }
+
+        try:
+            response = self.session.post(self.api_url, json=payload, timeout=deadline.timeout(15), stream=self.stream)
+            if response.status_code == 404 and tier is not self.model_cascade[-1]:
+                print(f"   [!] Model {model} not installed, skipping this cascade tier.")
+                tier["missing"] = True
+            if response.status_code != 200:
+                return None, None
+
+            if self.stream:
+                return self._read_stream(response)
+
+            data = response.json()
+            answer = json.loads(data.get("response", ""))
+            category = self._category_from_id(answer.get("c") if isinstance(answer, dict) else None)
+            return category, self._number_probability(data.get("logprobs") or [])
+        except Exception as e:
+            if deadline.expired():
+                raise BudgetExhausted("Time budget exhausted during the request") from e # Timeout capped by the budget
+            print(f"   [!] AI Error ({model}): {e}")
+            return None, None
+
+    def _read_stream(self, response):
+        """
+        Consumes Ollama's token stream (one JSON object per line) and stops as soon as the
+        category number is certain. Closing the connection makes Ollama stop generating.
+        Returns (category or None, probability or None).
+        """
+        text = ""
+        logprobs = []
+        try:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                text += chunk.get("response", "")
+                logprobs.extend(chunk.get("logprobs") or [])
+                category = self._match_partial(text)
+                if category or chunk.get("done"):
+                    return category, self._number_probability(logprobs)
+        finally:
+            response.close()
+        return None, None
+
+    def _number_probability(self, logprobs):
+        """Probability of the category number from the token logprobs, None if not reported."""
+        digits = [entry.get("logprob", 0.0) for entry in logprobs if any(ch.isdigit() for ch in entry.get("token", ""))]
+        return float(np.exp(sum(digits))) if digits else None
+
+    def _record_tier(self, model, accepted, seconds):
+        with self.stats_lock:
+            stats = self.tier_stats.setdefault(model, {"asked": 0, "accepted": 0, "seconds": 0.0})
+            stats["asked"] += 1
+            stats["accepted"] += int(accepted)
+            stats["seconds"] += seconds
+
+    def cascade_report(self):
+        """Per-tier hit rate and average latency since start, for tuning the cascade."""
+        with self.stats_lock:
+            parts = [
+                f"{model}: {stats['accepted']}/{stats['asked']} accepted, avg {stats['seconds'] / stats['asked']:.2f}s"
+                for model, stats in self.tier_stats.items()
+            ]
+        return "Cascade: " + " | ".join(parts)
+
+    def _match_partial(self, text):
+        """Category once the number in '{"c": 12' can no longer change, else None."""
+        match = re.search(r'"c"\s*:\s*(\d+)(\D?)', text)
+        if not match:
+            return None
+        number = int(match.group(1))
+        # Finished by a non-digit, or one more digit would exceed the category list (no leading zeros in JSON)
+        if match.group(2) or number == 0 or number * 10 >= len(rules_config.CATEGORIES):
+            return self._category_from_id(number)
+        return None
+
+    def _category_from_id(self, answer):
+        """Category for a category number, None for anything else."""
+        if type(answer) is int and 0 <= answer < len(rules_config.CATEGORIES):
+            return rules_config.CATEGORIES[answer]
+        return None
+
+    def save_manual_mapping(self, item_name, correct_category):
+        """Saves a manual correction (one journal append, no full rewrite)."""
+        self.save_manual_mappings([(item_name, correct_category)])
+
+    def save_manual_mappings(self, corrections):
+        """Saves several (item_name, category) corrections with one journal write."""
+        corrections = list(corrections)
+        for item_name, correct_category in corrections:
+            self.manual_mappings[item_name] = correct_category
+            self.mapping_index.add(self.normalize(item_name), correct_category)
+
+        self.mapping_journal.append_many(corrections)
+        if self.mapping_journal.needs_compaction():
+            self.mapping_journal.compact(self.manual_mappings)
\ No newline at end of file
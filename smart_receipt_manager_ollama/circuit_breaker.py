@@ -0,0 +1,81 @@
+# File: circuit_breaker.py
+import threading
+import time
+
+
+class Deadline:
+    """Time budget shared by all AI calls of one receipt (or batch)."""
+
+    def __init__(self, seconds):
+        self.end = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self.end - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def timeout(self, default):
+        """Request timeout: the usual one, but never longer than the remaining budget."""
+        return min(default, self.remaining())
+
+
+NO_DEADLINE = Deadline(float("inf"))
+
+
+class BudgetExhausted(TimeoutError):
+    """The Deadline ran out before a backend could answer. Not the backend's fault: breakers ignore it."""
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing backend.
+    After failure_threshold consecutive failures the circuit opens: calls are refused at once for
+    cooldown seconds. Then a single trial call decides whether it closes again or stays open.
+    """
+
+    def __init__(self, name, failure_threshold=3, cooldown=60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None # None = closed
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    def is_open(self):
+        """True while the backend is paused (no state change, unlike allow)."""
+        with self.lock:
+            return self.opened_at is not None and time.monotonic() - self.opened_at < self.cooldown
+
+    def allow(self):
+        """True if a call may be made now."""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial_running or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.trial_running = True # Half-open: exactly one caller tests the backend
+            return True
+
+    def record_success(self):
+        with self.lock:
+            if self.opened_at is not None:
+                print(f"   {self.name} answers again, circuit closed.")
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def release(self):
+        """The call ended without a verdict (time budget spent): a later call may run the trial again."""
+        with self.lock:
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial_running or (self.opened_at is None and self.failures >= self.failure_threshold):
+                if self.opened_at is None:
+                    print(f"   [!] {self.name} failed {self.failures} times in a row, pausing it for {self.cooldown:.0f}s.")
+                self.opened_at = time.monotonic()
+            self.trial_running = False
@@ -0,0 +1,157 @@
+# File: embedding_index.py
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+
+
+class EmbeddingIndex:
+    """
+    Nearest-neighbour index over embeddings of already categorized item names.
+    - embeddings.f32: raw float32 matrix (one L2-normalized row per name), memory-mapped
+    - embeddings_meta.jsonl: one line per row with name and category
+    - embeddings_info.json: embedding model and dimension (a new model resets the index)
+    Rows are only ever appended, so new receipts extend the index without a rebuild.
+    """
+
+    def __init__(self, folder, model_name):
+        self.vectors_file = folder / "embeddings.f32"
+        self.meta_file = folder / "embeddings_meta.jsonl"
+        self.info_file = folder / "embeddings_info.json"
+        self.model_name = model_name
+        self.lock = threading.Lock()
+
+        self.dim = None
+        self.names = set()
+        self.categories = [] # Row -> category
+        self.matrix = None
+        self._open()
+
+    def _open(self):
+        info = {}
+        if self.info_file.exists():
+            try:
+                with open(self.info_file, 'r', encoding='utf-8') as f:
+                    info = json.load(f)
+            except (OSError, ValueError):
+                info = {}
+
+        # Vectors of another model are not comparable
+        if info.get("model") != self.model_name:
+            for path in (self.vectors_file, self.meta_file, self.info_file):
+                if path.exists(): path.unlink()
+            return
+
+        self.dim = info["dim"]
+        if self.meta_file.exists():
+            with open(self.meta_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break # Torn last line from a crash
+                    self.names.add(entry["name"])
+                    self.categories.append(entry["category"])
+
+        # After a crash both files may disagree: keep the rows present in both
+        row_bytes = self.dim * 4
+        stored_rows = os.path.getsize(self.vectors_file) // row_bytes if self.vectors_file.exists() else 0
+        rows = min(stored_rows, len(self.categories))
+        if rows != stored_rows or rows != len(self.categories):
+            self._truncate(rows)
+        self._map(rows)
+
+    def _truncate(self, rows):
+        with open(self.vectors_file, 'ab') as f:
+            f.truncate(rows * self.dim * 4)
+        with open(self.meta_file, 'r', encoding='utf-8') as f:
+            lines = f.readlines()[:rows]
+        with open(self.meta_file, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+        self.categories = self.categories[:rows]
+        self.names = {json.loads(line)["name"] for line in lines}
+
+    def _map(self, rows):
+        if rows:
+            self.matrix = np.memmap(self.vectors_file, dtype=np.float32, mode='r', shape=(rows, self.dim))
+        else:
+            self.matrix = None
+
+    def __len__(self):
+        return len(self.categories)
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def add(self, names, vectors, categories):
+        """Appends new (name, vector, category) rows. Names already in the index are skipped."""
+        vectors = self._normalize(np.asarray(vectors, dtype=np.float32))
+
+        with self.lock:
+            keep = []
+            for i, name in enumerate(names):
+                if name not in self.names:
+                    self.names.add(name)
+                    keep.append(i)
+            if not keep:
+                return
+
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                with open(self.info_file, 'w', encoding='utf-8') as f:
+                    json.dump({"model": self.model_name, "dim": self.dim}, f)
+
+            # Vectors first, then meta: a crash in between is repaired by _open
+            with open(self.vectors_file, 'ab') as f:
+                f.write(vectors[keep].tobytes())
+            with open(self.meta_file, 'a', encoding='utf-8') as f:
+                for i in keep:
+                    f.write(json.dumps({"name": names[i], "category": categories[i]}, ensure_ascii=False) + "\n")
+
+            self.categories.extend(categories[i] for i in keep)
+            self._map(len(self.categories))
+
+    def query(self, vectors, k=5, threshold=0.88):
+        """
+        k-nearest-neighbour vote per query vector (cosine similarity).
+        Returns one (category, similarity) per query, or None if no neighbour passes threshold.
+        """
+        matrix = self.matrix
+        if matrix is None or len(vectors) == 0:
+            return [None] * len(vectors)
+
+        sims = self._normalize(np.asarray(vectors, dtype=np.float32)) @ matrix.T
+        k = min(k, sims.shape[1])
+        results = []
+        for row in sims:
+            top = np.argpartition(-row, k - 1)[:k]
+            votes = {}
+            best = {}
+            for idx in top:
+                if row[idx] < threshold:
+                    continue
+                category = self.categories[idx]
+                votes[category] = votes.get(category, 0.0) + float(row[idx])
+                best[category] = max(best.get(category, 0.0), float(row[idx]))
+
+            if votes:
+                category = max(votes, key=votes.get)
+                results.append((category, best[category]))
+            else:
+                results.append(None)
+        return results
+
+    def _normalize(self, vectors):
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+if __name__ == "__main__":
+    # Usage: python embedding_index.py build
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        from categorizer import ProductCategorizer
+        ProductCategorizer().build_embedding_index()
+    else:
+        print("Usage: python embedding_index.py build")
@@ -0,0 +1,63 @@
+# File: fuzzy_index.py
+from collections import Counter
+
+
+class TrigramIndex:
+    """
+    Character trigram index for fuzzy lookups of (normalized) item names.
+    Absorbs OCR variants like "joghurt natur" / "j0ghurt natur".
+    Similarity is the Dice coefficient of the trigram sets (0.0 - 1.0).
+    """
+
+    def __init__(self, threshold=0.75):
+        self.threshold = threshold
+        self.keys = [] # Key id -> text
+        self.values = [] # Key id -> stored value
+        self.key_ids = {} # Text -> key id
+        self.grams = [] # Key id -> number of distinct trigrams
+        self.postings = {} # Trigram -> set of key ids
+
+    def trigrams(self, text):
+        padded = f"  {text} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def add(self, text, value):
+        """Adds or updates one entry (incremental, no rebuild)."""
+        if not text:
+            return
+
+        if text in self.key_ids:
+            self.values[self.key_ids[text]] = value
+            return
+
+        key_id = len(self.keys)
+        grams = self.trigrams(text)
+        self.keys.append(text)
+        self.values.append(value)
+        self.key_ids[text] = key_id
+        self.grams.append(len(grams))
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(key_id)
+
+    def lookup(self, text):
+        """Returns (value, similarity) of the most similar entry above threshold, else None."""
+        if not text or not self.keys:
+            return None
+
+        if text in self.key_ids:
+            return self.values[self.key_ids[text]], 1.0
+
+        grams = self.trigrams(text)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+
+        best_id, best_score = None, 0.0
+        for key_id, count in shared.items():
+            score = 2.0 * count / (len(grams) + self.grams[key_id])
+            if score > best_score:
+                best_id, best_score = key_id, score
+
+        if best_id is None or best_score < self.threshold:
+            return None
+        return self.values[best_id], best_score
@@ -0,0 +1,134 @@
+# File: image_preprocessing.py
+import numpy as np
+from PIL import Image, ImageOps, ImageEnhance
+
+# ~300 DPI on 80 mm thermal paper: 40-48 characters per line give an x-height of ~20-30 px,
+# the range Tesseract reads best. More pixels only cost OCR time.
+TARGET_WIDTH = 1000
+CROP_HEADROOM = 2.0 # The receipt usually covers at least half of the photo width
+PROFILE_WIDTH = 200 # Resolution of the projection profiles
+EXIF_ORIENTATION = 0x0112 # Values 5-8: stored rotated by 90 degrees
+
+
+def upright_width(img):
+    """Width after exif_transpose: portrait phone photos are often stored landscape."""
+    return img.height if img.getexif().get(EXIF_ORIENTATION, 1) in (5, 6, 7, 8) else img.width
+
+
+def open_image(image_path, target_width=TARGET_WIDTH):
+    """
+    Opens an image as grayscale. JPEGs are decoded in draft mode (DCT scaling),
+    only as large as needed for the target width after cropping.
+    """
+    img = Image.open(image_path)
+    if target_width and img.format == "JPEG":
+        scale = min(1.0, target_width * CROP_HEADROOM / upright_width(img))
+        img.draft("L", (int(img.width * scale), int(img.height * scale)))
+    return ImageOps.grayscale(ImageOps.exif_transpose(img)) # Phone photos are often stored rotated
+
+
+def _span(profile, min_fraction):
+    """First and last index where the profile reaches min_fraction (None if nowhere)."""
+    hits = np.flatnonzero(profile >= min_fraction)
+    if hits.size == 0:
+        return None
+    return hits[0], hits[-1] + 1
+
+
+def find_receipt_box(img, margin=0.02, min_area=0.25):
+    """
+    Bounding box of the (bright) receipt on a darker background, from projection profiles.
+    Returns None if nothing sensible is found (then the image is not cropped).
+    """
+    scale = PROFILE_WIDTH / img.width
+    small = np.asarray(img.resize((PROFILE_WIDTH, max(1, int(img.height * scale)))), dtype=np.float32)
+    paper = small > small.mean()
+
+    # Columns that are mostly paper, then rows that are mostly paper inside these columns
+    cols = _span(paper.mean(axis=0), 0.5)
+    if cols is None:
+        return None
+    rows = _span(paper[:, cols[0]:cols[1]].mean(axis=1), 0.5)
+    if rows is None:
+        return None
+
+    h, w = small.shape
+    if (cols[1] - cols[0]) * (rows[1] - rows[0]) < min_area * w * h:
+        return None
+    pad_x, pad_y = int(w * margin), int(h * margin)
+    box = (max(0, cols[0] - pad_x), max(0, rows[0] - pad_y), min(w, cols[1] + pad_x), min(h, rows[1] + pad_y))
+    return tuple(int(round(v / scale)) for v in box)
+
+
+def find_skew_angle(img, max_angle=5.0, step=0.5):
+    """Angle (degrees) with the sharpest row profile: text lines are horizontal there."""
+    scale = PROFILE_WIDTH * 2 / img.width
+    small = img.resize((PROFILE_WIDTH * 2, max(1, int(img.height * scale))))
+    ink_threshold = np.asarray(small, dtype=np.float32).mean()
+
+    best_angle, best_score = 0.0, -1.0
+    for angle in np.arange(-max_angle, max_angle + step / 2, step):
+        rotated = np.asarray(small.rotate(angle, fillcolor=255), dtype=np.float32)
+        profile = (rotated < ink_threshold).sum(axis=1).astype(np.float32)
+        score = float(np.square(np.diff(profile)).sum())
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+
+def binarize_adaptive(img, block=31, offset=10):
+    """Local mean threshold (integral image), robust against shadows and uneven light."""
+    arr = np.asarray(img, dtype=np.float64) # float32 sums lose precision on large images
+    h, w = arr.shape
+    r = block // 2
+    integral = np.pad(arr, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+
+    y0 = np.clip(np.arange(h) - r, 0, h)[:, None]
+    y1 = np.clip(np.arange(h) + r + 1, 0, h)[:, None]
+    x0 = np.clip(np.arange(w) - r, 0, w)[None, :]
+    x1 = np.clip(np.arange(w) + r + 1, 0, w)[None, :]
+    window_sum = integral[y1, x1] - integral[y0, x1] - integral[y1, x0] + integral[y0, x0]
+    local_mean = window_sum / ((y1 - y0) * (x1 - x0))
+
+    return Image.fromarray(np.where(arr > local_mean - offset, 255, 0).astype(np.uint8))
+
+
+def preprocess(image_path, target_width=TARGET_WIDTH, crop=True, deskew=False, binarize=False):
+    """
+    Image file -> grayscale image ready for Tesseract.
+    Only a found receipt is scaled to target_width: without one (bright table, small receipt)
+    the photo width says nothing about the text size, so the photo keeps its full resolution.
+    crop=False keeps the full resolution (previous behaviour).
+    """
+    img = open_image(image_path, target_width if crop else None)
+
+    # 1. Crop to the receipt
+    box = find_receipt_box(img) if crop else None
+    if target_width and (box is None or box[2] - box[0] < target_width):
+        # The draft decode bet on a receipt covering half the photo: decode again at full size
+        with Image.open(image_path) as header:
+            full_width = upright_width(header)
+        if img.width < full_width:
+            factor = full_width / img.width
+            img = open_image(image_path, None)
+            box = box and tuple(int(round(v * factor)) for v in box)
+    if box:
+        img = img.crop(box)
+
+    # 2. Straighten slightly rotated photos
+    if deskew:
+        angle = find_skew_angle(img)
+        if angle:
+            img = img.rotate(angle, resample=Image.Resampling.BICUBIC, fillcolor=255)
+
+    # 3. Normalize the resolution of the receipt (never upscale)
+    if box and target_width and img.width > target_width:
+        img = img.resize((target_width, max(1, round(img.height * target_width / img.width))), Image.Resampling.LANCZOS)
+
+    # 4. Contrast and sharpness (as before)
+    img = ImageOps.autocontrast(img)
+    img = ImageEnhance.Sharpness(img).enhance(2.0)
+
+    if binarize:
+        img = binarize_adaptive(img)
+    return img
@@ -0,0 +1,81 @@
+# File: mapping_journal.py
+import json
+import os
+
+
+class MappingJournal:
+    """
+    Crash-safe storage for manual mappings.
+    - manual_mappings.json: compacted snapshot, only ever replaced atomically
+    - manual_mappings.jsonl: append-only journal, one JSON line per correction
+    The journal is replayed over the snapshot at load and compacted when it grows past compact_bytes.
+    """
+
+    def __init__(self, snapshot_file, journal_file, compact_bytes=256 * 1024):
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file
+        self.compact_bytes = compact_bytes
+        self.tail_checked = False
+
+    def load(self):
+        mappings = {}
+
+        # 1. Snapshot
+        if os.path.exists(self.snapshot_file):
+            try:
+                with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                    mappings = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"   [!] Manual mappings snapshot unreadable, using journal only: {e}")
+
+        # 2. Journal replay (a torn last line from a crash is skipped)
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        mappings[entry["name"]] = entry["category"]
+                    except (ValueError, KeyError, TypeError):
+                        print(f"   [!] Skipping damaged journal line: {line.strip()[:60]}")
+
+        return mappings
+
+    def append(self, item_name, category):
+        self.append_many([(item_name, category)])
+
+    def append_many(self, entries):
+        """Appends several corrections with one open/flush."""
+        # A torn line from an earlier crash must not swallow the next entry
+        repair = not self.tail_checked and self._has_torn_tail()
+        self.tail_checked = True
+
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            if repair: f.write("\n")
+            for item_name, category in entries:
+                f.write(json.dumps({"name": item_name, "category": category}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _has_torn_tail(self):
+        if not os.path.exists(self.journal_file) or os.path.getsize(self.journal_file) == 0:
+            return False
+        with open(self.journal_file, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def needs_compaction(self):
+        return os.path.exists(self.journal_file) and os.path.getsize(self.journal_file) > self.compact_bytes
+
+    def compact(self, mappings):
+        """Writes the full mapping as new snapshot (atomic replace), then empties the journal."""
+        self._atomic_write(self.snapshot_file, json.dumps(mappings, indent=4, ensure_ascii=False))
+        # A crash before this line only means the journal is replayed once more (idempotent)
+        self._atomic_write(self.journal_file, "")
+
+    def _atomic_write(self, path, text):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
@@ -0,0 +1,140 @@
+# File: ocr_profiles.py
+# Named OCR profiles: trade accuracy for throughput explicitly.
+# The default profile comes from settings.json ("ocr_profile"), the import page can pick one per batch.
+# Measure them on your own receipts: python ocr_benchmark.py path/to/images --profiles fast,best
+import csv
+import json
+import re
+from collections import Counter
+
+from path_config import CSV_FOLDER, SETTINGS_FILE, TESSERACT_EXE
+
+OCR_PROFILES = {
+    "adaptive": {
+        "description": "Cheap low-resolution pass, 'best' only for receipts that fail validation",
+        "tessdata": "tessdata_fast",
+        "psm": 6,
+        "whitelist": True,
+        "user_words": True,
+        "threads": 1,
+        "preprocessing": {"target_width": 800},
+        "fallback": "best",          # Second pass when the parsed receipt does not add up
+    },
+    "fast": {
+        "description": "Clean thermal-printer receipts",
+        "tessdata": "tessdata_fast", # Folder next to tessdata in tesseract_bin (falls back to tessdata)
+        "psm": 6,                    # One uniform text block
+        "whitelist": True,
+        "user_words": True,
+        "threads": 1,                # Tesseract threads per image, the pool runs cores / threads images at once
+        "preprocessing": {},
+    },
+    "best": {
+        "description": "Crumpled, curved or badly lit photos",
+        "tessdata": "tessdata_best",
+        "psm": 4,                    # Single column of text of variable sizes
+        "whitelist": True,
+        "user_words": True,
+        "threads": 2,
+        "preprocessing": {"target_width": 1400, "deskew": True, "binarize": True},
+    },
+}
+DEFAULT_PROFILE = "adaptive"
+
+LANGUAGE = "deu"
+
+# Characters that occur on German receipts (no quotes or spaces, they break the -c argument)
+RECEIPT_WHITELIST = (
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÜ"
+    "abcdefghijklmnopqrstuvwxyzäöüß"
+    "0123456789"
+    ".,:;-+*/%&()€#=<>"
+)
+
+USER_WORDS_FILE = CSV_FOLDER / "ocr_user_words.txt"
+MAX_USER_WORDS = 5000
+
+
+def default_profile_name():
+    """Profile from settings.json, DEFAULT_PROFILE if none (or an unknown one) is set."""
+    if SETTINGS_FILE.exists():
+        try:
+            with open(SETTINGS_FILE, 'r') as f:
+                name = json.load(f).get("ocr_profile")
+            if name in OCR_PROFILES:
+                return name
+        except: pass
+    return DEFAULT_PROFILE
+
+
+def get_profile(name=None):
+    """Profile dict by name (None = default from settings)."""
+    name = name or default_profile_name()
+    if name not in OCR_PROFILES:
+        print(f"   [!] Unknown OCR profile '{name}', using '{DEFAULT_PROFILE}'.")
+        name = DEFAULT_PROFILE
+    return dict(OCR_PROFILES[name], name=name)
+
+
+def profile_chain(name=None):
+    """The profile and the ones it escalates to, e.g. [adaptive, best]."""
+    chain = [get_profile(name)]
+    while chain[-1].get("fallback") and len(chain) < len(OCR_PROFILES):
+        chain.append(get_profile(chain[-1]["fallback"]))
+    return chain
+
+
+def build_user_words():
+    """
+    Writes the most frequent words of our item-name history to USER_WORDS_FILE.
+    Only rebuilt when an items_*.csv partition changed since. Returns the file or None.
+    """
+    items_files = list(CSV_FOLDER.glob("items_*.csv"))
+    if not items_files:
+        return None
+    if USER_WORDS_FILE.exists() and USER_WORDS_FILE.stat().st_mtime >= max(f.stat().st_mtime for f in items_files):
+        return USER_WORDS_FILE
+
+    counts = Counter()
+    for items_file in items_files:
+        with open(items_file, mode='r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                counts.update(re.findall(r"[A-Za-zÄÖÜäöüß]{3,}", row.get('item_name') or ""))
+
+    with open(USER_WORDS_FILE, 'w', encoding='utf-8') as f:
+        for word, _ in counts.most_common(MAX_USER_WORDS):
+            f.write(word + "\n")
+    return USER_WORDS_FILE
+
+
+def tesseract_options(profile):
+    """Engine settings of a profile, shared by the command line and the resident (tesserocr) backend."""
+    options = {"lang": LANGUAGE, "psm": profile["psm"], "tessdata_dir": None, "variables": {}, "user_words": None,
+               "threads": profile["threads"]}
+
+    tessdata_dir = TESSERACT_EXE.parent / profile["tessdata"] if profile.get("tessdata") else None
+    if tessdata_dir and (tessdata_dir / f"{LANGUAGE}.traineddata").exists():
+        options["tessdata_dir"] = str(tessdata_dir)
+    elif tessdata_dir:
+        print(f"   [!] {tessdata_dir.name}/{LANGUAGE}.traineddata not found, using the default tessdata.")
+
+    if profile.get("whitelist"):
+        options["variables"]["tessedit_char_whitelist"] = RECEIPT_WHITELIST
+
+    if profile.get("user_words"):
+        user_words = build_user_words()
+        if user_words:
+            options["user_words"] = str(user_words)
+    return options
+
+
+def tesseract_args(options):
+    """Command line options (a list, so paths with spaces need no quoting)."""
+    args = ["-l", options["lang"], "--psm", str(options["psm"])]
+    if options["tessdata_dir"]:
+        args += ["--tessdata-dir", options["tessdata_dir"]]
+    for name, value in options["variables"].items():
+        args += ["-c", f"{name}={value}"]
+    if options["user_words"]:
+        args += ["--user-words", options["user_words"]]
+    return args
@@ -1,85 +1,108 @@
-# File: worker.py
-import time
-import shutil
-from pathlib import Path
-from PIL import Image
-from PyQt6.QtCore import QThread, pyqtSignal
-
-# Import core processing logic from main
-import main as logic_processor 
-
-class ReceiptWorker(QThread):
-    item_updated = pyqtSignal(int, str, str) 
-    finished_all = pyqtSignal()
-
-    def __init__(self, task_type, items_to_process, target_folder):
-        super().__init__()
-        self.task_type = task_type
-        self.items = items_to_process
-        self.target_folder = Path(target_folder)
-
-    def run(self):
-        if self.task_type == "import":
-            self.run_import_task()
-        elif self.task_type == "process":
-            self.run_process_task() # Core logic execution
-        
-        self.finished_all.emit()
-
-    def run_import_task(self):
-        """Copies files to the local target folder and converts images to PDF."""
-        self.target_folder.mkdir(parents=True, exist_ok=True)
-
-        for row, source_path_str in self.items:
-            source_path = Path(source_path_str)
-            
-            try:
-                # Determine target filename
-                if source_path.suffix.lower() in ['.png', '.jpg', '.jpeg']:
-                    target_name = source_path.stem + ".pdf"
-                    is_image = True
-                else:
-                    target_name = source_path.name
-                    is_image = False
-                
-                target_path = self.target_folder / target_name
-
-                # Copy or Convert
-                if is_image:
-                    image = Image.open(source_path)
-                    image = image.convert('RGB')
-                    image.save(target_path)
-                else:
-                    # Overwrite if file already exists
-                    shutil.copy2(source_path, target_path)
-
-                # GUI Update: First step completed
-                new_display_text = f"✅ ⬜   {target_name}"
-                self.item_updated.emit(row, new_display_text, str(target_path))
-                
-                time.sleep(0.1) # Visual feedback delay
-
-            except Exception as e:
-                print(f"Import Error: {e}")
-
-    def run_process_task(self):
-        """Invokes the offline main.py logic for each file."""
-        
-        for row, file_path_str in self.items:
-            try:
-                # 1. Execute processing function from main.py
-                # Steps: Scan -> Clean -> AI Categorization -> CSV Export -> Move
-                logic_processor.process_single_file(file_path_str)
-                
-                # 2. Update path to the new processed location
-                filename = Path(file_path_str).name
-                processed_path = logic_processor.PROCESSED_FOLDER / filename
-                
-                # 3. GUI Update: Full processing completed
-                new_display_text = f"✅ ✅   {filename}"
-                self.item_updated.emit(row, new_display_text, str(processed_path))
-
-            except Exception as e:
-                print(f"CRITICAL PROCESS ERROR: {e}")
-                # Optional: Indicate error in GUI
-                self.item_updated.emit(row, f"✅ ❌   Error: {str(e)}", file_path_str)
\ No newline at end of file
+# File: worker.py
+import shutil
+from pathlib import Path
+from PyQt6.QtCore import QThread, pyqtSignal
+
+# Import core processing logic from main
+import main as logic_processor 
+from backfill import BackfillJob
+from path_config import TESSERACT_EXE, INPUT_FOLDER
+from jpg_png_2_pdf import ReceiptProcessor, default_backend
+
+class ReceiptWorker(QThread):
+    item_updated = pyqtSignal(int, str, str) 
+    status_updated = pyqtSignal(str) # Progress text of the backfill task
+    finished_all = pyqtSignal()
+
+    def __init__(self, task_type, items_to_process, target_folder, ocr_profile=None):
+        super().__init__()
+        self.task_type = task_type
+        self.items = items_to_process
+        self.target_folder = Path(target_folder)
+        
+        # Initialize our OCR processor specifically for the import step
+        if self.task_type == "import":
+            # Resident tesserocr engine only on opt-in (OCR_BACKEND=tesserocr)
+            self.pdf_processor = ReceiptProcessor(TESSERACT_EXE, INPUT_FOLDER, profile=ocr_profile, backend=default_backend())
+
+    def run(self):
+        if self.task_type == "import":
+            self.run_import_task()
+        elif self.task_type == "process":
+            self.run_process_task() # Core logic execution
+        elif self.task_type == "backfill":
+            self.run_backfill_task()
+        
+        self.finished_all.emit()
+
+    def run_import_task(self):
+        """Copies files to the Input folder and uses Tesseract (process pool) to create searchable PDFs."""
+        self.target_folder.mkdir(parents=True, exist_ok=True)
+        images = {} # Copied image path -> (row, source path)
+
+        for row, source_path_str in self.items:
+            source_path = Path(source_path_str)
+            
+            try:
+                # 1. First, copy the original file to the Input folder
+                temp_target_path = self.target_folder / source_path.name
+                shutil.copy2(source_path, temp_target_path)
+
+                # 2. Images are OCR'd below in parallel, PDFs need no conversion
+                if temp_target_path.suffix.lower() in self.pdf_processor.valid_extensions:
+                    images[temp_target_path] = (row, source_path_str)
+                else:
+                    # GUI Update: First checkmark
+                    self.item_updated.emit(row, f"✅ ⬜   {temp_target_path.name}", str(temp_target_path))
+
+            except Exception as e:
+                print(f"Import Error: {e}")
+                self.item_updated.emit(row, f"❌ ⬜   Error: {str(e)}", source_path_str)
+
+        # 3. OCR all images, rows are updated in the order the conversions finish
+        try:
+            for image_path, final_pdf_path, text, error in self.pdf_processor.convert_many(list(images)):
+                row, source_path_str = images[image_path]
+                if error or not final_pdf_path:
+                    print(f"Import Error: {error}")
+                    self.item_updated.emit(row, f"❌ ⬜   Error: OCR Conversion failed ({error})", source_path_str)
+                else:
+                    logic_processor.ocr_texts[str(final_pdf_path)] = text # Parsed later without reopening the PDF
+                    self.item_updated.emit(row, f"✅ ⬜   {final_pdf_path.name}", str(final_pdf_path))
+        except Exception as e:
+            print(f"CRITICAL IMPORT ERROR: {e}") # Unconverted rows stay importable
+        finally:
+            self.pdf_processor.close()
+
+    def run_process_task(self):
+        """Invokes the offline main.py logic for all files as one batch."""
+        file_paths = [file_path_str for _, file_path_str in self.items]
+
+        def on_result(index, result_msg):
+            row, file_path_str = self.items[index]
+            filename = Path(file_path_str).name
+            processed_path = logic_processor.PROCESSED_FOLDER / filename
+
+            # GUI Update: Full processing completed
+            new_display_text = f"✅ ✅   {filename}"
+            self.item_updated.emit(row, new_display_text, str(processed_path))
+
+        try:
+            # Steps: Scan all -> Clean -> AI Categorization (each distinct name once) -> CSV Export -> Move
+            logic_processor.process_batch(file_paths, on_result)
+
+        except Exception as e:
+            print(f"CRITICAL PROCESS ERROR: {e}")
+            # Optional: Indicate error in GUI for files that are not done yet
+            for row, file_path_str in self.items:
+                if Path(file_path_str).exists():
+                    self.item_updated.emit(row, f"✅ ❌   Error: {str(e)}", file_path_str)
+
+    def run_backfill_task(self):
+        """Re-categorizes UNCATEGORIZED rows of the whole history (resumable)."""
+        try:
+            job = BackfillJob(logic_processor.get_ai_boss())
+            job.run(on_progress=self.status_updated.emit, should_stop=self.isInterruptionRequested)
+        except Exception as e:
+            print(f"CRITICAL BACKFILL ERROR: {e}")
+            self.status_updated.emit(f"Backfill error: {e}")